@@ -1,3 +1,5 @@
+import sys
+
 from nilai_py import Client
 
 from config import API_KEY
@@ -11,6 +13,8 @@ def main():
     # The API key will be displayed in the subscription details.
     # The Client class automatically handles the NUC token creation and management.
     ## For sandbox, use the following:
+    ## (verify=False disables TLS verification, never use it in production)
+    ## The same pooled HTTP client is reused for every API request made by the Client.
     http_client = DefaultHttpxClient(verify=False)
 
     # Create the OpenAI client with the custom endpoint and API key
@@ -34,12 +38,17 @@ def main():
         stream=True,
     )
 
-    for chunk in response:
+    # Write the streamed tokens directly and flush every few chunks
+    # instead of flushing stdout once per token
+    for i, chunk in enumerate(response):
         if chunk.choices[0].finish_reason is not None:
-            print("\n[DONE]")
+            sys.stdout.write("\n[DONE]\n")
             break
         if chunk.choices[0].delta.content is not None:
-            print(chunk.choices[0].delta.content, end="", flush=True)
+            sys.stdout.write(chunk.choices[0].delta.content)
+            if i % 16 == 0:
+                sys.stdout.flush()
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,24 @@
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv(override=True)
+
+@functools.cache
+def _ensure_env() -> None:
+    """Load the .env file once, the first time a setting is needed."""
+    load_dotenv(override=True)
 
 
 def get_api_key() -> str:
+    _ensure_env()
     api_key: str | None = os.getenv("API_KEY", None)
     if api_key is None:
         raise ValueError("API_KEY is not set")
     return api_key
 
 
-API_KEY: str = get_api_key()
+def __getattr__(name: str) -> str:
+    # Resolve API_KEY lazily so that importing this module does not read the environment
+    if name == "API_KEY":
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
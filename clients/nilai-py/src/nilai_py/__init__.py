@@ -1,19 +1,59 @@
-from nilai_py.client import Client
-from nilai_py.server import DelegationTokenServer
-from nilai_py.niltypes import (
-    DelegationTokenRequest,
-    DelegationTokenResponse,
-    AuthType,
-    DelegationServerConfig,
-    PromptDocumentInfo,
-    DelegationTokenServerType,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from nilai_py.client import Client
+    from nilai_py.server import DelegationTokenServer
+    from nilai_py.verify_cache import TokenVerificationCache
+    from nilai_py.niltypes import (
+        DelegationTokenRequest,
+        DelegationTokenResponse,
+        DelegationTokenRequestModel,
+        DelegationTokenResponseModel,
+        AuthType,
+        DelegationServerConfig,
+        PromptDocumentInfo,
+        DelegationTokenServerType,
+    )
+
+# The public names are imported on first access (PEP 562), so importing the package
+# does not load the nuc / secretvaults / secp256k1 stacks until they are needed.
+_LAZY_IMPORTS: dict[str, str] = {
+    "Client": "nilai_py.client",
+    "DelegationTokenServer": "nilai_py.server",
+    "TokenVerificationCache": "nilai_py.verify_cache",
+    "DelegationTokenRequest": "nilai_py.niltypes",
+    "DelegationTokenResponse": "nilai_py.niltypes",
+    "DelegationTokenRequestModel": "nilai_py.niltypes",
+    "DelegationTokenResponseModel": "nilai_py.niltypes",
+    "AuthType": "nilai_py.niltypes",
+    "DelegationServerConfig": "nilai_py.niltypes",
+    "PromptDocumentInfo": "nilai_py.niltypes",
+    "DelegationTokenServerType": "nilai_py.niltypes",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "Client",
     "DelegationTokenServer",
+    "TokenVerificationCache",
     "DelegationTokenRequest",
     "DelegationTokenResponse",
+    "DelegationTokenRequestModel",
+    "DelegationTokenResponseModel",
     "AuthType",
     "DelegationServerConfig",
     "PromptDocumentInfo",
@@ -2,7 +2,7 @@ import json
 import os
 import openai
 from typing_extensions import override
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 
 import base64
@@ -14,7 +14,6 @@ import datetime
 from nuc.envelope import NucTokenEnvelope
 from nuc.token import Did, InvocationBody
 from nuc.builder import NucTokenBuilder
-from nilai_py.nildb import NilDBPromptManager
 
 from nilai_py.niltypes import (
     DelegationTokenRequest,
@@ -26,10 +25,28 @@ from nilai_py.niltypes import (
 
 from nilai_py.common import is_expired, new_root_token
 
+if TYPE_CHECKING:
+    from nilai_py.nildb import NilDBPromptManager
+
+
+def _nildb_prompt_manager() -> type["NilDBPromptManager"]:
+    """
+    Import the nilDB prompt manager on first use.
+
+    The nilDB integration pulls in `secretvaults`, which is by far the most expensive
+    import of the package and is not needed unless prompts are stored in nilDB.
+    """
+    from nilai_py.nildb import NilDBPromptManager
+
+    return NilDBPromptManager
+
 
 class Client(openai.Client):
     def __init__(self, *args, **kwargs):
         self.auth_type: AuthType = kwargs.pop("auth_type", AuthType.API_KEY)
+        # When set, the public key is fetched through the client's own `http_client`
+        # and its TLS settings instead of an unverified standalone request
+        self.verify_public_key_tls: bool = kwargs.pop("verify_public_key_tls", False)
 
         match self.auth_type:
             case AuthType.API_KEY:
@@ -46,6 +63,8 @@ class Client(openai.Client):
         # Retrieve the public key from the nilai server
         try:
             self.nilai_public_key = self._get_nilai_public_key()
+            # The audience of every invocation token, serialized only once
+            self._nilai_did: Did = Did(self.nilai_public_key.serialize())
             print(
                 "Retrieved nilai public key:", self.nilai_public_key.serialize().hex()
             )
@@ -94,6 +113,11 @@ class Client(openai.Client):
         """
         Retrieve the nilai public key from the nilai server.
 
+        By default the request skips TLS verification, so servers with self-signed
+        certificates (e.g. the sandbox) work out of the box. With
+        `verify_public_key_tls=True`, it goes through the client's own `http_client`
+        instead, reusing its pooled connection and TLS settings.
+
         Returns:
             NilAuthPublicKey: The nilai public key.
 
@@ -101,7 +125,13 @@ class Client(openai.Client):
             RuntimeError: If the nilai public key cannot be retrieved.
         """
         try:
-            public_key_response = httpx.get(f"{self.base_url}public_key", verify=False)
+            url = f"{self.base_url}public_key"
+            if self.verify_public_key_tls:
+                # Reuse the pooled connection of the underlying HTTP client, which is
+                # also used for the subsequent API requests.
+                public_key_response = self._client.get(url)
+            else:
+                public_key_response = httpx.get(url, verify=False)
             if public_key_response.status_code != 200:
                 raise RuntimeError(
                     f"Failed to retrieve the nilai public key: {public_key_response.text}"
@@ -162,7 +192,7 @@ class Client(openai.Client):
         invocation_token: str = (
             NucTokenBuilder.extending(self.delegation_token)
             .body(InvocationBody(args={}))
-            .audience(Did(self.nilai_public_key.serialize()))
+            .audience(self._nilai_did)
             .build(self.nilauth_private_key)
         )
         return invocation_token
@@ -179,7 +209,7 @@ class Client(openai.Client):
         invocation_token: str = (
             NucTokenBuilder.extending(self.root_token)
             .body(InvocationBody(args={}))
-            .audience(Did(self.nilai_public_key.serialize()))
+            .audience(self._nilai_did)
             .build(self.nilauth_private_key)
         )
         return invocation_token
@@ -191,7 +221,9 @@ class Client(openai.Client):
         return {"Authorization": f"Bearer {api_key}"}
 
     async def async_list_prompts_from_nildb(self) -> None:
-        prompt_manager = await NilDBPromptManager.init(nilai_url=str(self.base_url))
+        prompt_manager = await _nildb_prompt_manager().init(
+            nilai_url=str(self.base_url)
+        )
         await prompt_manager.list_prompts()
         await prompt_manager.close()
 
@@ -199,7 +231,9 @@ class Client(openai.Client):
         return asyncio.run(self.async_list_prompts_from_nildb())
 
     async def async_store_prompt_to_nildb(self, prompt: str, dir: str) -> List[str]:
-        prompt_manager = await NilDBPromptManager.init(nilai_url=str(self.base_url))
+        prompt_manager = await _nildb_prompt_manager().init(
+            nilai_url=str(self.base_url)
+        )
 
         invocation_token = self._get_invocation_token()
         result = await prompt_manager.create_prompt(
@@ -1,40 +1,90 @@
 import datetime
+import math
+import time
+import weakref
 from nuc.envelope import NucTokenEnvelope
 from nuc.token import Command, NucToken, Did
 from nuc.builder import NucTokenBuilder, DelegationBody
 from secp256k1 import PrivateKey
 
+# Static pieces shared by root and delegation tokens
+_EMPTY_DELEGATION_BODY = DelegationBody([])
+GENERATE_COMMAND = Command(["nil", "ai", "generate"])
+_ROOT_TOKEN_LIFETIME = datetime.timedelta(hours=1)
+_UTC = datetime.timezone.utc
+
+
+# POSIX expiration timestamps of the envelopes already checked by `is_expired`
+_expiry_timestamps: "weakref.WeakKeyDictionary[NucTokenEnvelope, float]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def is_expired(token_envelope: NucTokenEnvelope) -> bool:
     """
     Check if a token envelope is expired.
 
+    The expiration of each envelope is converted to a POSIX timestamp once, so
+    repeated checks on the same envelope are a single float comparison.
+
     Args:
         token_envelope (NucTokenEnvelope): The token envelope to check.
 
     Returns:
         bool: True if the token envelope is expired, False otherwise.
     """
+    expires_at_ts = _expiry_timestamps.get(token_envelope)
+    if expires_at_ts is None:
+        token: NucToken = token_envelope.token.token
+        expires_at_ts = (
+            token.expires_at.timestamp() if token.expires_at is not None else math.inf
+        )
+        _expiry_timestamps[token_envelope] = expires_at_ts
+    return expires_at_ts < time.time()
+
+
+def expiry_deadline(
+    token_envelope: NucTokenEnvelope, skew_seconds: float = 0.0
+) -> float:
+    """
+    Convert the expiration of a token envelope into a `time.monotonic()` deadline.
+
+    Args:
+        token_envelope (NucTokenEnvelope): The token envelope to compute the deadline for.
+        skew_seconds (float): Safety margin subtracted from the deadline so that the
+            token is considered expired slightly before it actually is.
+
+    Returns:
+        float: The monotonic deadline, or `math.inf` if the token never expires.
+    """
     token: NucToken = token_envelope.token.token
     if token.expires_at is None:
-        return False
-    return token.expires_at < datetime.datetime.now(datetime.timezone.utc)
+        return math.inf
+    remaining = token.expires_at - datetime.datetime.now(_UTC)
+    return time.monotonic() + remaining.total_seconds() - skew_seconds
 
 
-def new_root_token(private_key: PrivateKey) -> NucTokenEnvelope:
+def new_root_token(
+    private_key: PrivateKey, public_key: bytes | None = None
+) -> NucTokenEnvelope:
     """
     Force the creation of a new root token.
+
+    Args:
+        private_key (PrivateKey): The private key used to sign the root token.
+        public_key (bytes | None): The serialized public key of `private_key`.
+            If not provided, it is serialized from the private key.
     """
-    hex_public_key = private_key.pubkey
-    if hex_public_key is None:
-        raise ValueError("Public key is None")
-    hex_public_key = hex_public_key.serialize()
+    if public_key is None:
+        if private_key.pubkey is None:
+            raise ValueError("Public key is None")
+        public_key = private_key.pubkey.serialize()
+    did = Did(public_key)
     root_token = NucTokenBuilder(
-        body=DelegationBody([]),
-        audience=Did(hex_public_key),
-        subject=Did(hex_public_key),
-        expires_at=datetime.datetime.now(datetime.timezone.utc)
-        + datetime.timedelta(hours=1),
-        command=Command(["nil", "ai", "generate"]),
+        body=_EMPTY_DELEGATION_BODY,
+        audience=did,
+        subject=did,
+        expires_at=datetime.datetime.now(_UTC) + _ROOT_TOKEN_LIFETIME,
+        command=GENERATE_COMMAND,
     ).build(private_key)
     return NucTokenEnvelope.parse(root_token)
@@ -12,17 +12,25 @@ from datetime import datetime
 from secretvaults import SecretVaultUserClient
 from secretvaults.common.keypair import Keypair
 
+# Shared model configurations
+_RESULT_CONFIG = ConfigDict(
+    extra="allow",
+    validate_assignment=True,
+    use_enum_values=True,
+    populate_by_name=True,
+    arbitrary_types_allowed=True,
+)
+_LOOSE_CONFIG = ConfigDict(
+    extra="allow", validate_assignment=True, populate_by_name=True
+)
+# Value objects that are never mutated after creation
+_FROZEN_CONFIG = ConfigDict(frozen=True)
+
 
 class BaseResult(BaseModel):
     """Base result model for all operations"""
 
-    model_config = ConfigDict(
-        extra="allow",
-        validate_assignment=True,
-        use_enum_values=True,
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-    )
+    model_config = _RESULT_CONFIG
 
     success: bool
     error: Optional[Union[str, Exception]] = None
@@ -32,7 +40,7 @@ class BaseResult(BaseModel):
 class PromptDelegationToken(BaseModel):
     """Delegation token model"""
 
-    model_config = ConfigDict(validate_assignment=True)
+    model_config = _FROZEN_CONFIG
 
     token: str
     did: str
@@ -41,9 +49,7 @@ class PromptDelegationToken(BaseModel):
 class TimestampedModel(BaseModel):
     """Base model with timestamp fields"""
 
-    model_config = ConfigDict(
-        extra="allow", validate_assignment=True, populate_by_name=True
-    )
+    model_config = _LOOSE_CONFIG
 
     created_at: Optional[datetime] = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
@@ -110,7 +116,7 @@ class OperationResult(BaseResult):
 class DocumentReference(BaseModel):
     """Reference to a document"""
 
-    model_config = ConfigDict(validate_assignment=True)
+    model_config = _FROZEN_CONFIG
 
     builder: str
     collection: str
@@ -129,7 +135,7 @@ class RegistrationStatus(str, Enum):
 class DelegationToken(BaseModel):
     """Delegation token model"""
 
-    model_config = ConfigDict(validate_assignment=True)
+    model_config = _FROZEN_CONFIG
 
     token: str
     did: str
@@ -1,6 +1,7 @@
 import enum
-from typing import Optional
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Any, Optional
+from pydantic import BaseModel, TypeAdapter
 from secp256k1 import PrivateKey as NilAuthPrivateKey, PublicKey as NilAuthPublicKey
 
 
@@ -19,7 +20,8 @@ class PromptDocumentInfo(BaseModel):
     owner_did: str
 
 
-class DelegationServerConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DelegationServerConfig:
     mode: DelegationTokenServerType = DelegationTokenServerType.SUBSCRIPTION_OWNER
     expiration_time: Optional[int] = 60
     token_max_uses: Optional[int] = 1
@@ -31,15 +33,99 @@ class RequestType(enum.Enum):
     DELEGATION_TOKEN_RESPONSE = "DELEGATION_TOKEN_RESPONSE"
 
 
-class DelegationTokenRequest(BaseModel):
+# Delegation requests and responses are created on the token-minting hot path,
+# so they are plain dataclasses. The pydantic models below are meant for the
+# wire boundary (e.g. validating a request received over HTTP). The dataclasses
+# keep the model_dump, model_dump_json and model_validate methods they had as
+# pydantic models, so existing callers keep working.
+@dataclass(slots=True, frozen=True)
+class DelegationTokenRequest:
+    public_key: str
+    type: RequestType = RequestType.DELEGATION_TOKEN_REQUEST
+
+    def to_json(self) -> bytes:
+        return _DELEGATION_TOKEN_REQUEST_ADAPTER.dump_json(self)
+
+    @staticmethod
+    def from_json(data: str | bytes) -> "DelegationTokenRequest":
+        return _DELEGATION_TOKEN_REQUEST_ADAPTER.validate_json(data)
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        return _DELEGATION_TOKEN_REQUEST_ADAPTER.dump_python(self, **kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        return _DELEGATION_TOKEN_REQUEST_ADAPTER.dump_json(self, **kwargs).decode()
+
+    @staticmethod
+    def model_validate(obj: Any) -> "DelegationTokenRequest":
+        return _DELEGATION_TOKEN_REQUEST_ADAPTER.validate_python(obj)
+
+    @staticmethod
+    def model_validate_json(data: str | bytes) -> "DelegationTokenRequest":
+        return DelegationTokenRequest.from_json(data)
+
+
+@dataclass(slots=True, frozen=True)
+class DelegationTokenResponse:
+    delegation_token: str
+    type: RequestType = RequestType.DELEGATION_TOKEN_RESPONSE
+
+    def to_json(self) -> bytes:
+        return _DELEGATION_TOKEN_RESPONSE_ADAPTER.dump_json(self)
+
+    @staticmethod
+    def from_json(data: str | bytes) -> "DelegationTokenResponse":
+        return _DELEGATION_TOKEN_RESPONSE_ADAPTER.validate_json(data)
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        return _DELEGATION_TOKEN_RESPONSE_ADAPTER.dump_python(self, **kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        return _DELEGATION_TOKEN_RESPONSE_ADAPTER.dump_json(self, **kwargs).decode()
+
+    @staticmethod
+    def model_validate(obj: Any) -> "DelegationTokenResponse":
+        return _DELEGATION_TOKEN_RESPONSE_ADAPTER.validate_python(obj)
+
+    @staticmethod
+    def model_validate_json(data: str | bytes) -> "DelegationTokenResponse":
+        return DelegationTokenResponse.from_json(data)
+
+
+# Built once so that wire encoding goes straight through pydantic-core
+_DELEGATION_TOKEN_REQUEST_ADAPTER = TypeAdapter(DelegationTokenRequest)
+_DELEGATION_TOKEN_RESPONSE_ADAPTER = TypeAdapter(DelegationTokenResponse)
+
+
+class DelegationTokenRequestModel(BaseModel):
     type: RequestType = RequestType.DELEGATION_TOKEN_REQUEST
     public_key: str
 
+    def to_request(self) -> DelegationTokenRequest:
+        return DelegationTokenRequest(public_key=self.public_key, type=self.type)
+
+    @classmethod
+    def from_request(
+        cls, request: DelegationTokenRequest
+    ) -> "DelegationTokenRequestModel":
+        return cls(public_key=request.public_key, type=request.type)
 
-class DelegationTokenResponse(BaseModel):
+
+class DelegationTokenResponseModel(BaseModel):
     type: RequestType = RequestType.DELEGATION_TOKEN_RESPONSE
     delegation_token: str
 
+    def to_response(self) -> DelegationTokenResponse:
+        return DelegationTokenResponse(
+            delegation_token=self.delegation_token, type=self.type
+        )
+
+    @classmethod
+    def from_response(
+        cls, response: DelegationTokenResponse
+    ) -> "DelegationTokenResponseModel":
+        return cls(delegation_token=response.delegation_token, type=response.type)
+
 
 DefaultDelegationTokenServerConfig = DelegationServerConfig(
     expiration_time=60,
@@ -53,5 +139,7 @@ __all__ = [
     "AuthType",
     "DelegationTokenRequest",
     "DelegationTokenResponse",
+    "DelegationTokenRequestModel",
+    "DelegationTokenResponseModel",
     "DefaultDelegationTokenServerConfig",
 ]
@@ -1,6 +1,9 @@
-from typing import Any, Dict, Optional
+from __future__ import annotations
+
+from typing import Any
 from nilai_py.niltypes import (
     DelegationTokenRequest,
+    DelegationTokenRequestModel,
     DelegationTokenResponse,
     DelegationServerConfig,
     DefaultDelegationTokenServerConfig,
@@ -8,11 +11,82 @@ from nilai_py.niltypes import (
     NilAuthPrivateKey,
 )
 
-from nilai_py.common import is_expired, new_root_token
+from nilai_py.common import GENERATE_COMMAND, expiry_deadline, new_root_token
 from nuc.envelope import NucTokenEnvelope
 from nuc.token import Did
-from nuc.builder import NucTokenBuilder, Command
+from nuc.builder import NucTokenBuilder
+import asyncio
 import datetime
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Refresh the root token this many seconds before it actually expires
+ROOT_TOKEN_EXPIRY_SKEW_SECONDS = 60.0
+
+# Immutable pieces shared by every delegation token
+_UTC = datetime.timezone.utc
+
+# Signing happens in libsecp256k1 without holding the GIL, so async callers offload
+# it to threads instead of blocking the event loop. The pool is shared by every
+# server, and its threads are only started when first needed.
+_SIGN_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="nilai-sign"
+)
+
+
+def _expiration_delta(config: DelegationServerConfig) -> datetime.timedelta:
+    """
+    Get the lifetime of the delegation tokens issued with the given configuration.
+
+    Args:
+        config (DelegationServerConfig): The configuration of the delegation tokens.
+
+    Returns:
+        datetime.timedelta: The lifetime of the tokens (10 seconds if not configured).
+    """
+    return _timedelta_seconds(config.expiration_time if config.expiration_time else 10)
+
+
+@functools.lru_cache(maxsize=64)
+def _timedelta_seconds(seconds: int) -> datetime.timedelta:
+    return datetime.timedelta(seconds=seconds)
+
+
+@functools.lru_cache(maxsize=4096)
+def _audience_did(public_key_hex: str) -> Did:
+    """
+    Decode a hex encoded public key into its audience Did.
+
+    Clients usually request several tokens with the same key, and `Did` is a
+    frozen dataclass, so decoded audiences are cached and shared across requests.
+
+    Args:
+        public_key_hex (str): The hex encoded public key of the client.
+
+    Returns:
+        Did: The Did for the public key.
+    """
+    return Did(bytes.fromhex(public_key_hex))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_private_key(private_key_hex: str) -> NilAuthPrivateKey:
+    """
+    Load a private key from its hex encoding.
+
+    Servers re-created with the same key (e.g. on reloads, or across workers forked
+    after the first load) share a single key object instead of parsing it again.
+
+    Args:
+        private_key_hex (str): The hex encoded private key.
+
+    Returns:
+        NilAuthPrivateKey: The private key.
+    """
+    return NilAuthPrivateKey(bytes.fromhex(private_key_hex))
 
 
 class DelegationTokenServer:
@@ -29,13 +103,24 @@ class DelegationTokenServer:
             config (DelegationServerConfig): The configuration for the server.
         """
         self.config: DelegationServerConfig = config
-        self.private_key: NilAuthPrivateKey = NilAuthPrivateKey(
-            bytes.fromhex(private_key)
+        self._expires_delta: datetime.timedelta = _expiration_delta(config)
+        self.private_key: NilAuthPrivateKey = _load_private_key(private_key)
+        if self.private_key.pubkey is None:
+            raise ValueError("Public key is None")
+        # The key pair is immutable, so the serialized public key and the
+        # delegation request derived from it are computed only once.
+        self._pubkey_bytes: bytes = self.private_key.pubkey.serialize()
+        self._delegation_request: DelegationTokenRequest = DelegationTokenRequest(
+            public_key=self._pubkey_bytes.hex()
         )
-        self._root_token_envelope: Optional[NucTokenEnvelope] = None
+        self._root_token_envelope: NucTokenEnvelope | None = None
+        self._root_expires_at_ts: float = 0.0
+        # Tokens are signed from the threads of the signing pool, so the root token
+        # and its deadline are read and refreshed together under this lock.
+        self._root_token_lock = threading.RLock()
 
     @property
-    def root_token(self) -> Optional[NucTokenEnvelope]:
+    def root_token(self) -> NucTokenEnvelope | None:
         """
         Get the root token envelope. If the root token is expired, it will be refreshed.
         The root token is used to create delegation tokens.
@@ -43,13 +128,37 @@ class DelegationTokenServer:
         Returns:
             NucTokenEnvelope: The root token envelope.
         """
-        if self._root_token_envelope is None or is_expired(self._root_token_envelope):
-            if self.config.mode == DelegationTokenServerType.DELEGATION_ISSUER:
-                raise ValueError(
-                    "In DELEGATION_ISSUER mode, the root token cannot be refreshed, it must be provided"
+        with self._root_token_lock:
+            if (
+                self._root_token_envelope is None
+                or time.monotonic() >= self._root_expires_at_ts
+            ):
+                if self.config.mode == DelegationTokenServerType.DELEGATION_ISSUER:
+                    raise ValueError(
+                        "In DELEGATION_ISSUER mode, the root token cannot be refreshed, it must be provided"
+                    )
+                self._set_root_token(
+                    new_root_token(self.private_key, self._pubkey_bytes),
+                    ROOT_TOKEN_EXPIRY_SKEW_SECONDS,
                 )
-            self._root_token_envelope = new_root_token(self.private_key)
-        return self._root_token_envelope
+            return self._root_token_envelope
+
+    def _set_root_token(
+        self, root_token_envelope: NucTokenEnvelope, skew_seconds: float = 0.0
+    ):
+        """
+        Store the root token envelope together with its monotonic expiry deadline.
+
+        Args:
+            root_token_envelope (NucTokenEnvelope): The new root token envelope.
+            skew_seconds (float): How long before its expiration the token is refreshed.
+                Only self-minted root tokens can be refreshed, so provided delegation
+                tokens are used until they actually expire.
+        """
+        expires_at_ts = expiry_deadline(root_token_envelope, skew_seconds)
+        with self._root_token_lock:
+            self._root_token_envelope = root_token_envelope
+            self._root_expires_at_ts = expires_at_ts
 
     def update_delegation_token(self, root_token: str):
         """
@@ -62,7 +171,7 @@ class DelegationTokenServer:
             raise ValueError(
                 "Delegation token can only be updated in DELEGATION_ISSUER mode"
             )
-        self._root_token_envelope = NucTokenEnvelope.parse(root_token)
+        self._set_root_token(NucTokenEnvelope.parse(root_token))
 
     def get_delegation_request(self) -> DelegationTokenRequest:
         """
@@ -71,55 +180,102 @@ class DelegationTokenServer:
         Returns:
             DelegationTokenRequest: The delegation request.
         """
-        if self.private_key.pubkey is None:
-            raise ValueError("Public key is None")
-        delegation_request: DelegationTokenRequest = DelegationTokenRequest(
-            public_key=self.private_key.pubkey.serialize().hex()
-        )
-        return delegation_request
+        return self._delegation_request
 
     def create_delegation_token(
         self,
-        delegation_token_request: DelegationTokenRequest,
-        config_override: Optional[DelegationServerConfig] = None,
+        delegation_token_request: DelegationTokenRequest | DelegationTokenRequestModel,
+        config_override: DelegationServerConfig | None = None,
     ) -> DelegationTokenResponse:
         """
         Create a delegation token.
 
         Args:
-            delegation_token_request (DelegationTokenRequest): The delegation token request.
+            delegation_token_request (DelegationTokenRequest | DelegationTokenRequestModel): The delegation token request.
             config_override (DelegationServerConfig): The configuration override.
 
         Returns:
             DelegationTokenResponse: The delegation token response.
         """
+        return self.create_delegation_tokens(
+            [delegation_token_request], config_override=config_override
+        )[0]
+
+    async def create_delegation_token_async(
+        self,
+        delegation_token_request: DelegationTokenRequest | DelegationTokenRequestModel,
+        config_override: DelegationServerConfig | None = None,
+    ) -> DelegationTokenResponse:
+        """
+        Create a delegation token without blocking the running event loop.
+
+        Args:
+            delegation_token_request (DelegationTokenRequest | DelegationTokenRequestModel): The delegation token request.
+            config_override (DelegationServerConfig): The configuration override.
+
+        Returns:
+            DelegationTokenResponse: The delegation token response.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            _SIGN_POOL,
+            self.create_delegation_token,
+            delegation_token_request,
+            config_override,
+        )
+
+    def create_delegation_tokens(
+        self,
+        delegation_token_requests: list[
+            DelegationTokenRequest | DelegationTokenRequestModel
+        ],
+        config_override: DelegationServerConfig | None = None,
+    ) -> list[DelegationTokenResponse]:
+        """
+        Create a delegation token for each of the given requests.
+
+        The configuration, token metadata, root token and expiration time are resolved
+        once for the whole batch, so only the audience and the signature are computed
+        per token. All the public keys are decoded before any token is signed.
+
+        Args:
+            delegation_token_requests (list[DelegationTokenRequest | DelegationTokenRequestModel]): The delegation token requests.
+            config_override (DelegationServerConfig): The configuration override.
+
+        Returns:
+            list[DelegationTokenResponse]: The delegation token responses, in request order.
+        """
         config: DelegationServerConfig = (
             config_override if config_override else self.config
         )
 
-        public_key: bytes = bytes.fromhex(delegation_token_request.public_key)
+        audiences: list[Did] = [
+            _audience_did(request.public_key) for request in delegation_token_requests
+        ]
 
-        meta: Dict[str, Any] = {
+        meta: dict[str, Any] = {
             "usage_limit": config.token_max_uses,
         }
         if config.prompt_document:
             meta["document_id"] = config.prompt_document.doc_id
             meta["document_owner_did"] = config.prompt_document.owner_did
 
-        if self.root_token is None:
+        root_token = self.root_token
+        if root_token is None:
             raise ValueError("Root token is None")
 
-        delegated_token = (
-            NucTokenBuilder.extending(self.root_token)
-            .expires_at(
-                datetime.datetime.now(datetime.timezone.utc)
-                + datetime.timedelta(
-                    seconds=config.expiration_time if config.expiration_time else 10
-                )
-            )
-            .audience(Did(public_key))
-            .command(Command(["nil", "ai", "generate"]))
-            .meta(meta)
-            .build(self.private_key)
+        expires_delta = (
+            self._expires_delta if config is self.config else _expiration_delta(config)
         )
-        return DelegationTokenResponse(delegation_token=delegated_token)
+        expires_at = datetime.datetime.now(_UTC) + expires_delta
+
+        return [
+            DelegationTokenResponse(
+                delegation_token=NucTokenBuilder.extending(root_token)
+                .expires_at(expires_at)
+                .audience(audience)
+                .command(GENERATE_COMMAND)
+                .meta(meta)
+                .build(self.private_key)
+            )
+            for audience in audiences
+        ]
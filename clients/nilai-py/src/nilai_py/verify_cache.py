@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from nuc.envelope import NucTokenEnvelope
+from nuc.validate import NucTokenValidator, ValidationParameters
+
+from nilai_py.common import expiry_deadline, is_expired
+
+
+class TokenVerificationCache:
+    """
+    In-process cache of successful NUC token verifications.
+
+    Delegation tokens are short lived (60 seconds by default), so a verifier that sees
+    the same token several times only needs to run the signature and chain validation
+    once. Expired tokens are rejected before any validation takes place, and entries
+    are evicted when they reach their TTL, when the token expires, or when the cache
+    is full (least recently used first).
+    """
+
+    def __init__(
+        self,
+        validator: NucTokenValidator,
+        parameters: Optional[ValidationParameters] = None,
+        maxsize: int = 65536,
+        ttl: float = 60.0,
+    ):
+        """
+        Initialize the token verification cache.
+
+        Args:
+            validator (NucTokenValidator): The validator used on cache misses.
+            parameters (ValidationParameters): The validation parameters used on cache misses.
+            maxsize (int): The maximum number of verified tokens to keep.
+            ttl (float): The maximum number of seconds a verification is reused.
+        """
+        self.validator: NucTokenValidator = validator
+        self.parameters: ValidationParameters = (
+            parameters if parameters is not None else ValidationParameters.default()
+        )
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._entries: OrderedDict[str, Tuple[NucTokenEnvelope, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def verify(self, token: str) -> NucTokenEnvelope:
+        """
+        Verify a token, reusing a previous successful verification if there is one.
+
+        Args:
+            token (str): The serialized NUC token.
+
+        Returns:
+            NucTokenEnvelope: The parsed and verified token envelope.
+
+        Raises:
+            ValueError: If the token is expired.
+            ValidationException: If the token fails validation.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(token)
+        if entry is not None:
+            envelope, deadline = entry
+            if now < deadline:
+                self._entries.move_to_end(token)
+                return envelope
+            self._entries.pop(token, None)
+
+        envelope = NucTokenEnvelope.parse(token)
+        if is_expired(envelope):
+            raise ValueError("Token has expired")
+        self.validator.validate(envelope, context={}, parameters=self.parameters)
+
+        self._entries[token] = (
+            envelope,
+            min(now + self.ttl, expiry_deadline(envelope)),
+        )
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return envelope
+
+    def clear(self) -> None:
+        """Remove all cached verifications."""
+        self._entries.clear()
+
+
+__all__ = ["TokenVerificationCache"]
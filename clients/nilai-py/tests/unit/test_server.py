@@ -17,15 +17,20 @@ The tests use extensive mocking to isolate the DelegationTokenServer logic
 from external dependencies like NilauthClient and cryptographic operations.
 """
 
+import asyncio
 import datetime
+import time
 import pytest
 from unittest.mock import Mock, patch
 from nilai_py.server import DelegationTokenServer
 from nilai_py.niltypes import (
     DelegationTokenRequest,
+    DelegationTokenRequestModel,
     DelegationTokenResponse,
+    DelegationTokenResponseModel,
     DelegationServerConfig,
     DefaultDelegationTokenServerConfig,
+    DelegationTokenServerType,
     RequestType,
 )
 from nilai_py.common import is_expired
@@ -101,11 +106,30 @@ class TestDelegationTokenServer:
 
         assert server.config == custom_config
 
+    def test_init_reuses_parsed_private_key(self, private_key_hex):
+        """Test that servers created with the same key share the parsed key."""
+        first = DelegationTokenServer(private_key_hex)
+        second = DelegationTokenServer(private_key_hex)
+
+        assert first.private_key is second.private_key
+
     def test_init_invalid_private_key(self):
         """Test server initialization with invalid private key."""
         with pytest.raises(ValueError):
             DelegationTokenServer("invalid_hex_key")
 
+    def test_get_delegation_request_is_cached(self, private_key_hex):
+        """Test that the delegation request is built once from the server public key."""
+        server = DelegationTokenServer(private_key_hex)
+
+        request = server.get_delegation_request()
+
+        pubkey = server.private_key.pubkey
+        assert pubkey is not None
+        assert isinstance(request, DelegationTokenRequest)
+        assert request.public_key == pubkey.serialize().hex()
+        assert server.get_delegation_request() is request
+
     def test_is_expired_with_expired_token(
         self, private_key_hex, expired_token_envelope
     ):
@@ -213,6 +237,58 @@ class TestDelegationTokenServer:
         # Should call the client twice (once for initial, once for refresh)
         assert mock_client.request_token.call_count == 2
 
+    def test_root_token_reused_until_deadline(self, private_key_hex):
+        """Test root_token is reused until its monotonic deadline has passed."""
+        server = DelegationTokenServer(private_key_hex)
+
+        first = server.root_token
+        assert server.root_token is first
+        # One hour token minus the refresh skew
+        assert server._root_expires_at_ts > time.monotonic() + 3000
+
+        server._root_expires_at_ts = 0.0
+        assert server.root_token is not first
+
+    def test_root_token_refreshed_once_across_threads(
+        self, private_key_hex, mock_token_envelope
+    ):
+        """Test concurrent signing threads mint a single root token."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        server = DelegationTokenServer(private_key_hex)
+
+        def slow_new_root_token(*args):
+            time.sleep(0.01)
+            return mock_token_envelope
+
+        with patch(
+            "nilai_py.server.new_root_token", side_effect=slow_new_root_token
+        ) as mock_new_root_token:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                tokens = list(pool.map(lambda _: server.root_token, range(8)))
+
+        assert all(token is mock_token_envelope for token in tokens)
+        mock_new_root_token.assert_called_once()
+
+    def test_short_lived_delegated_root_token_is_usable(
+        self, private_key_hex, mock_token_envelope
+    ):
+        """Test a provided root token living less than the refresh skew is not expired."""
+        mock_token_envelope.token.token.expires_at = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(seconds=30)
+        server = DelegationTokenServer(
+            private_key_hex,
+            DelegationServerConfig(mode=DelegationTokenServerType.DELEGATION_ISSUER),
+        )
+
+        with patch(
+            "nilai_py.server.NucTokenEnvelope.parse", return_value=mock_token_envelope
+        ):
+            server.update_delegation_token("delegated-root-token")
+
+        assert server.root_token is mock_token_envelope
+
     @patch("nilai_py.server.NucTokenBuilder")
     def test_create_delegation_token_success(
         self,
@@ -232,7 +308,7 @@ class TestDelegationTokenServer:
         mock_builder.build.return_value = "delegation_token_string"
 
         server = DelegationTokenServer(private_key_hex)
-        server._root_token_envelope = mock_token_envelope
+        server._set_root_token(mock_token_envelope)
 
         result = server.create_delegation_token(delegation_request)
 
@@ -268,7 +344,7 @@ class TestDelegationTokenServer:
         mock_builder.build.return_value = "delegation_token_string"
 
         server = DelegationTokenServer(private_key_hex)
-        server._root_token_envelope = mock_token_envelope
+        server._set_root_token(mock_token_envelope)
 
         result = server.create_delegation_token(
             delegation_request, config_override=custom_config
@@ -281,12 +357,78 @@ class TestDelegationTokenServer:
             {"usage_limit": custom_config.token_max_uses}
         )
 
+    @patch("nilai_py.server.NucTokenBuilder")
+    def test_create_delegation_tokens_batch(
+        self,
+        mock_builder_class,
+        private_key_hex,
+        delegation_request,
+        mock_token_envelope,
+    ):
+        """Test batch delegation token creation shares the root token and expiry."""
+        mock_builder = Mock()
+        mock_builder_class.extending.return_value = mock_builder
+        mock_builder.expires_at.return_value = mock_builder
+        mock_builder.audience.return_value = mock_builder
+        mock_builder.command.return_value = mock_builder
+        mock_builder.meta.return_value = mock_builder
+        mock_builder.build.side_effect = ["token_1", "token_2", "token_3"]
+
+        server = DelegationTokenServer(private_key_hex)
+        server._set_root_token(mock_token_envelope)
+
+        results = server.create_delegation_tokens([delegation_request] * 3)
+
+        assert [r.delegation_token for r in results] == [
+            "token_1",
+            "token_2",
+            "token_3",
+        ]
+        assert mock_builder_class.extending.call_count == 3
+        mock_builder_class.extending.assert_called_with(mock_token_envelope)
+        expires = {c.args[0] for c in mock_builder.expires_at.call_args_list}
+        assert len(expires) == 1
+
+    def test_create_delegation_tokens_invalid_key_signs_nothing(
+        self, private_key_hex, public_key_hex, mock_token_envelope
+    ):
+        """Test that an invalid public key in a batch fails before any signing."""
+        server = DelegationTokenServer(private_key_hex)
+        server._set_root_token(mock_token_envelope)
+
+        with patch("nilai_py.server.NucTokenBuilder") as mock_builder_class:
+            with pytest.raises(ValueError):
+                server.create_delegation_tokens(
+                    [
+                        DelegationTokenRequest(public_key=public_key_hex),
+                        DelegationTokenRequest(public_key="invalid_hex"),
+                    ]
+                )
+            mock_builder_class.extending.assert_not_called()
+
+    def test_create_delegation_token_async(
+        self, private_key_hex, delegation_request, mock_token_envelope
+    ):
+        """Test that async delegation token creation signs in the thread pool."""
+        server = DelegationTokenServer(private_key_hex)
+        server._set_root_token(mock_token_envelope)
+
+        with patch.object(
+            server, "create_delegation_token", return_value="response"
+        ) as mock_create:
+            result = asyncio.run(
+                server.create_delegation_token_async(delegation_request)
+            )
+
+        assert result == "response"
+        mock_create.assert_called_once_with(delegation_request, None)
+
     def test_create_delegation_token_invalid_public_key(
         self, private_key_hex, mock_token_envelope
     ):
         """Test delegation token creation with invalid public key."""
         server = DelegationTokenServer(private_key_hex)
-        server._root_token_envelope = mock_token_envelope
+        server._set_root_token(mock_token_envelope)
 
         invalid_request = DelegationTokenRequest(public_key="invalid_hex")
 
@@ -344,7 +486,7 @@ class TestDelegationTokenServer:
             mock_builder.build.return_value = "delegation_token_string"
 
             server = DelegationTokenServer(private_key_hex)
-            server._root_token_envelope = mock_token_envelope
+            server._set_root_token(mock_token_envelope)
 
             server.create_delegation_token(delegation_request)
 
@@ -353,3 +495,72 @@ class TestDelegationTokenServer:
                 seconds=60
             )  # Default expiration
             mock_builder.expires_at.assert_called_once_with(expected_expiration)
+
+    def test_create_delegation_token_from_wire_model(
+        self, private_key_hex, public_key_hex, mock_token_envelope
+    ):
+        """Test that wire models convert to and from the hot-path dataclasses."""
+        request_model = DelegationTokenRequestModel.model_validate_json(
+            f'{{"public_key": "{public_key_hex}"}}'
+        )
+        assert request_model.to_request() == DelegationTokenRequest(
+            public_key=public_key_hex
+        )
+
+        with patch("nilai_py.server.NucTokenBuilder") as mock_builder_class:
+            mock_builder = Mock()
+            mock_builder_class.extending.return_value = mock_builder
+            mock_builder.expires_at.return_value = mock_builder
+            mock_builder.audience.return_value = mock_builder
+            mock_builder.command.return_value = mock_builder
+            mock_builder.meta.return_value = mock_builder
+            mock_builder.build.return_value = "delegation_token_string"
+
+            server = DelegationTokenServer(private_key_hex)
+            server._set_root_token(mock_token_envelope)
+            result = server.create_delegation_token(request_model)
+
+        assert isinstance(result, DelegationTokenResponse)
+        response_model = DelegationTokenResponseModel.from_response(result)
+        assert response_model.delegation_token == "delegation_token_string"
+        assert response_model.to_response() == result
+
+    def test_delegation_wire_json_round_trip(self, public_key_hex):
+        """Test JSON encoding and decoding of delegation requests and responses."""
+        request = DelegationTokenRequest(public_key=public_key_hex)
+        assert DelegationTokenRequest.from_json(request.to_json()) == request
+
+        response = DelegationTokenResponse(delegation_token="token")
+        encoded = response.to_json()
+        assert b'"DELEGATION_TOKEN_RESPONSE"' in encoded
+        assert DelegationTokenResponse.from_json(encoded) == response
+
+        with pytest.raises(ValueError):
+            DelegationTokenRequest.from_json(b"{}")
+
+    def test_delegation_dataclasses_keep_pydantic_methods(self, public_key_hex):
+        """Test the dataclasses still offer the methods of the former pydantic models."""
+        request = DelegationTokenRequest(public_key=public_key_hex)
+        dumped = request.model_dump()
+        assert dumped == {
+            "public_key": public_key_hex,
+            "type": RequestType.DELEGATION_TOKEN_REQUEST,
+        }
+        assert DelegationTokenRequest.model_validate(dumped) == request
+        assert (
+            DelegationTokenRequest.model_validate_json(request.model_dump_json())
+            == request
+        )
+
+        response = DelegationTokenResponse(delegation_token="token")
+        assert response.model_dump(mode="json") == {
+            "delegation_token": "token",
+            "type": "DELEGATION_TOKEN_RESPONSE",
+        }
+        assert (
+            DelegationTokenResponse.model_validate(
+                {"delegation_token": "token", "type": "DELEGATION_TOKEN_RESPONSE"}
+            )
+            == response
+        )
+        assert isinstance(response.model_dump_json(), str)
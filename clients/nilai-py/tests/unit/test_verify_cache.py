@@ -0,0 +1,97 @@
+"""
+Tests for the TokenVerificationCache class.
+"""
+
+import pytest
+from unittest.mock import Mock
+from nilai_py.server import DelegationTokenServer
+from nilai_py.verify_cache import TokenVerificationCache
+from nilai_py.niltypes import (
+    DelegationServerConfig,
+    DelegationTokenRequest,
+    NilAuthPrivateKey,
+)
+from nuc.validate import NucTokenValidator
+
+
+class TestTokenVerificationCache:
+    """Test cases for TokenVerificationCache class."""
+
+    @pytest.fixture
+    def server(self):
+        return DelegationTokenServer(
+            "a1b2c3d4e5f6789012345678901234567890abcdef1234567890abcdef123456"
+        )
+
+    @pytest.fixture
+    def delegation_token(self, server):
+        pubkey = NilAuthPrivateKey().pubkey
+        assert pubkey is not None
+        request = DelegationTokenRequest(public_key=pubkey.serialize().hex())
+        return server.create_delegation_token(request).delegation_token
+
+    @pytest.fixture
+    def validator(self):
+        validator = Mock(spec=NucTokenValidator)
+        validator.validate.return_value = None
+        return validator
+
+    def test_verify_validates_once(self, validator, delegation_token):
+        """Test that a verified token is not validated again."""
+        cache = TokenVerificationCache(validator)
+
+        first = cache.verify(delegation_token)
+        second = cache.verify(delegation_token)
+
+        assert first is second
+        validator.validate.assert_called_once()
+        assert len(cache) == 1
+
+    def test_verify_revalidates_after_ttl(self, validator, delegation_token):
+        """Test that a token is validated again once its entry has expired."""
+        cache = TokenVerificationCache(validator, ttl=0.0)
+
+        cache.verify(delegation_token)
+        cache.verify(delegation_token)
+
+        assert validator.validate.call_count == 2
+
+    def test_verify_rejects_expired_token_before_validation(self, server, validator):
+        """Test that expired tokens are rejected without running the validator."""
+        request = server.get_delegation_request()
+        token = server.create_delegation_token(
+            request, config_override=DelegationServerConfig(expiration_time=-60)
+        ).delegation_token
+        cache = TokenVerificationCache(validator)
+
+        with pytest.raises(ValueError, match="expired"):
+            cache.verify(token)
+        validator.validate.assert_not_called()
+
+    def test_verify_does_not_cache_failures(self, validator, delegation_token):
+        """Test that failed validations are not cached."""
+        validator.validate.side_effect = [Exception("invalid"), None]
+        cache = TokenVerificationCache(validator)
+
+        with pytest.raises(Exception, match="invalid"):
+            cache.verify(delegation_token)
+        cache.verify(delegation_token)
+
+        assert validator.validate.call_count == 2
+
+    def test_verify_evicts_least_recently_used(self, server, validator):
+        """Test that the cache never grows beyond maxsize."""
+        cache = TokenVerificationCache(validator, maxsize=2)
+        tokens = [
+            server.create_delegation_token(
+                server.get_delegation_request()
+            ).delegation_token
+            for _ in range(3)
+        ]
+
+        for token in tokens:
+            cache.verify(token)
+
+        assert len(cache) == 2
+        cache.verify(tokens[0])
+        assert validator.validate.call_count == 4
@@ -0,0 +1,38 @@
+"""perf: covering index for token usage
+
+Revision ID: 3f1c9e7a5b2d
+Revises: 43b23c73035b
+Create Date: 2026-10-16 10:12:41.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9e7a5b2d"
+down_revision: Union[str, None] = "43b23c73035b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The token counters are included in the user_id index, so the usage aggregation
+    # is answered from the index without visiting the table
+    op.create_index(
+        "ix_query_logs_user_id_usage",
+        "query_logs",
+        ["user_id"],
+        unique=False,
+        postgresql_include=["prompt_tokens", "completion_tokens", "total_tokens"],
+    )
+    op.drop_index(op.f("ix_query_logs_user_id"), table_name="query_logs")
+
+
+def downgrade() -> None:
+    op.create_index(
+        op.f("ix_query_logs_user_id"), "query_logs", ["user_id"], unique=False
+    )
+    op.drop_index("ix_query_logs_user_id_usage", table_name="query_logs")
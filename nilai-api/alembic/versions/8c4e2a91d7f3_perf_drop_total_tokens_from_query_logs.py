@@ -0,0 +1,51 @@
+"""perf: drop total_tokens from query_logs
+
+Revision ID: 8c4e2a91d7f3
+Revises: 3f1c9e7a5b2d
+Create Date: 2026-10-16 11:02:18.730554
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2a91d7f3"
+down_revision: Union[str, None] = "3f1c9e7a5b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # total_tokens is always prompt_tokens + completion_tokens, it is computed on read
+    op.drop_index("ix_query_logs_user_id_usage", table_name="query_logs")
+    op.drop_column("query_logs", "total_tokens")
+    op.create_index(
+        "ix_query_logs_user_id_usage",
+        "query_logs",
+        ["user_id"],
+        unique=False,
+        postgresql_include=["prompt_tokens", "completion_tokens"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_query_logs_user_id_usage", table_name="query_logs")
+    op.add_column(
+        "query_logs",
+        sa.Column(
+            "total_tokens", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.execute("UPDATE query_logs SET total_tokens = prompt_tokens + completion_tokens")
+    op.alter_column("query_logs", "total_tokens", server_default=None)
+    op.create_index(
+        "ix_query_logs_user_id_usage",
+        "query_logs",
+        ["user_id"],
+        unique=False,
+        postgresql_include=["prompt_tokens", "completion_tokens", "total_tokens"],
+    )
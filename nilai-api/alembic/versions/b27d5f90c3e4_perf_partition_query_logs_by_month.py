@@ -0,0 +1,112 @@
+"""perf: partition query_logs by month
+
+Revision ID: b27d5f90c3e4
+Revises: e5a7b3c8f0d1
+Create Date: 2026-10-16 12:25:53.904117
+
+Downtime: the whole query_logs table is copied inside the migration transaction,
+which holds an ACCESS EXCLUSIVE lock on it until the copy commits. Query logging
+blocks for the duration of the copy, which grows with the size of the table, so
+run this migration during a maintenance window on large deployments.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b27d5f90c3e4"
+down_revision: Union[str, None] = "e5a7b3c8f0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The rows are copied to a table partitioned by query_timestamp, with one partition
+    # per month up to two months ahead. Later months are created by the API at startup
+    # (ensure_query_log_partitions), rows outside of them land in query_logs_default
+    # until the partition of their month is created.
+    op.execute("ALTER TABLE query_logs RENAME TO query_logs_unpartitioned")
+    # Keep the id sequence when the unpartitioned table is dropped
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE query_logs (
+            LIKE query_logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (query_timestamp)
+        """
+    )
+    op.execute("ALTER TABLE query_logs ADD PRIMARY KEY (id, query_timestamp)")
+    op.execute("CREATE TABLE query_logs_default PARTITION OF query_logs DEFAULT")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start date;
+        BEGIN
+            month_start := date_trunc(
+                'month',
+                COALESCE(
+                    (SELECT min(query_timestamp) FROM query_logs_unpartitioned),
+                    now()
+                ) AT TIME ZONE 'UTC'
+            );
+            WHILE month_start <= date_trunc('month', now() AT TIME ZONE 'UTC')
+                    + interval '2 months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF query_logs FOR VALUES FROM (%L) TO (%L)',
+                    'query_logs_y' || to_char(month_start, 'YYYY') || 'm'
+                        || to_char(month_start, 'MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute("INSERT INTO query_logs SELECT * FROM query_logs_unpartitioned")
+    op.execute("DROP TABLE query_logs_unpartitioned")
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY query_logs.id")
+
+    op.create_index(
+        op.f("ix_query_logs_lockid"), "query_logs", ["lockid"], unique=False
+    )
+    op.create_index(
+        "ix_query_logs_user_id_usage",
+        "query_logs",
+        ["user_id"],
+        unique=False,
+        postgresql_include=["prompt_tokens", "completion_tokens"],
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE query_logs RENAME TO query_logs_partitioned")
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE query_logs (
+            LIKE query_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )
+        """
+    )
+    op.execute("INSERT INTO query_logs SELECT * FROM query_logs_partitioned")
+    # Dropping the partitioned table drops all of its partitions
+    op.execute("DROP TABLE query_logs_partitioned")
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY query_logs.id")
+    op.execute("ALTER TABLE query_logs ADD PRIMARY KEY (id)")
+
+    op.create_index(
+        op.f("ix_query_logs_lockid"), "query_logs", ["lockid"], unique=False
+    )
+    op.create_index(
+        "ix_query_logs_user_id_usage",
+        "query_logs",
+        ["user_id"],
+        unique=False,
+        postgresql_include=["prompt_tokens", "completion_tokens"],
+    )
@@ -0,0 +1,52 @@
+"""perf: jsonb user rate limits
+
+Revision ID: c4d8e2f6a1b3
+Revises: b27d5f90c3e4
+Create Date: 2026-10-16 14:02:17.640391
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f6a1b3"
+down_revision: Union[str, None] = "b27d5f90c3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # JSONB is stored parsed, and can be indexed for containment queries
+    op.alter_column(
+        "users",
+        "rate_limits",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="rate_limits::jsonb",
+    )
+    op.create_index(
+        "ix_users_rate_limits",
+        "users",
+        ["rate_limits"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"rate_limits": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_rate_limits", table_name="users")
+    op.alter_column(
+        "users",
+        "rate_limits",
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="rate_limits::json",
+    )
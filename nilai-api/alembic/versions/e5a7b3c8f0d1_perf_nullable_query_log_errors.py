@@ -0,0 +1,56 @@
+"""perf: nullable query log errors
+
+Revision ID: e5a7b3c8f0d1
+Revises: 8c4e2a91d7f3
+Create Date: 2026-10-16 11:40:05.281946
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a7b3c8f0d1"
+down_revision: Union[str, None] = "8c4e2a91d7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Successful queries store NULL instead of an error code and an empty message
+    op.alter_column(
+        "query_logs",
+        "error_code",
+        existing_type=sa.Integer(),
+        nullable=True,
+        server_default=None,
+    )
+    op.alter_column(
+        "query_logs",
+        "error_message",
+        existing_type=sa.Text(),
+        nullable=True,
+        server_default=None,
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE query_logs SET error_code = 0 WHERE error_code IS NULL")
+    op.execute("UPDATE query_logs SET error_message = '' WHERE error_message IS NULL")
+    op.alter_column(
+        "query_logs",
+        "error_message",
+        existing_type=sa.Text(),
+        nullable=False,
+        server_default=sa.text("'OK'"),
+    )
+    op.alter_column(
+        "query_logs",
+        "error_code",
+        existing_type=sa.Integer(),
+        nullable=False,
+        server_default=sa.text("200"),
+    )
@@ -4,6 +4,9 @@
 from prometheus_fastapi_instrumentator import Instrumentator
 from fastapi import Depends, FastAPI
 from nilai_api.auth import get_auth_info
+from nilai_api.db.logs import ensure_query_log_partitions, query_log_batcher
+from nilai_api.handlers.nilrag import warmup_embeddings_model
+from nilai_api.handlers.tools.code_execution import sandbox_pool
 from nilai_api.rate_limiting import setup_redis_conn
 from nilai_api.routers import private, public
 from nilai_api import config
@@ -15,9 +18,19 @@ from nilai_common.config import SETTINGS
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     client, rate_limit_command = await setup_redis_conn(config.CONFIG.redis.url)
+    await ensure_query_log_partitions()
+    query_log_batcher.start()
+    await warmup_embeddings_model()
+    if sandbox_pool.configured:
+        sandbox_pool.start()
 
     yield {"redis": client, "redis_rate_limit_command": rate_limit_command}
 
+    await sandbox_pool.stop()
+
+    # Write the query logs still queued before shutting down
+    await query_log_batcher.stop()
+
 
 host = SETTINGS.host
 description = f"""
@@ -1,10 +1,15 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
 from fastapi import Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from logging import getLogger
 
+from nilai_api.cache import TTLCache, token_hash
 from nilai_api.config import CONFIG
-from nilai_api.auth.strategies import AuthenticationStrategy
+from nilai_api.auth.strategies import STRATEGIES
 
 from nuc.validate import ValidationException
 from nilai_api.auth.nuc_helpers.usage import UsageLimitError
@@ -20,22 +25,131 @@ logger = getLogger(__name__)
 bearer_scheme = HTTPBearer()
 
 
+def _resolve_strategy(
+    strategy_name: str,
+) -> Callable[[str], Awaitable[AuthenticationInfo]]:
+    """
+    Resolve the configured authentication strategy
+
+    Args:
+        strategy_name: The name of the strategy, case insensitive
+
+    Returns:
+        The authentication strategy function
+
+    Raises:
+        AuthenticationError: If the strategy does not exist
+    """
+    strategy_name = strategy_name.lower()
+    try:
+        return STRATEGIES[strategy_name]
+    except KeyError:  # If the strategy is not found, we raise an error
+        logger.error(f"Invalid auth strategy: {strategy_name}")
+        raise AuthenticationError(
+            f"Server misconfiguration: invalid auth strategy: {strategy_name}"
+        )
+
+
+# The strategy is constant for the lifetime of the process, so a misconfiguration
+# fails at startup instead of on every request
+_RESOLVED_STRATEGY: Callable[[str], Awaitable[AuthenticationInfo]] = _resolve_strategy(
+    CONFIG.auth.auth_strategy
+)
+
+# Successful authentications keyed by the token hash, so that repeated requests with
+# the same bearer token skip the NUC parsing, signature validation and credential checks
+AUTH_CACHE_MAXSIZE = 10000
+AUTH_CACHE_TTL_SECONDS = 30.0
+_auth_cache: TTLCache[bytes, AuthenticationInfo] = TTLCache(
+    maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL_SECONDS
+)
+# Authentications in progress keyed by the token hash, so that concurrent requests
+# with the same bearer token share a single validation
+_in_flight: Dict[bytes, "asyncio.Task[AuthenticationInfo]"] = {}
+
+
+def _auth_info_expires_at(auth_info: AuthenticationInfo) -> Optional[datetime]:
+    """
+    Get the earliest expiration date of the token, its proofs and its usage limits
+
+    Args:
+        auth_info: The authentication info of the token
+
+    Returns:
+        The earliest expiration date, or None if nothing in the token expires
+    """
+    expirations = []
+    if auth_info.expires_at is not None:
+        expirations.append(auth_info.expires_at)
+    if auth_info.token_rate_limit is not None:
+        expirations.extend(
+            limit.expires_at for limit in auth_info.token_rate_limit.limits
+        )
+    return min(expirations) if expirations else None
+
+
+def _cache_auth_info(key: bytes, auth_info: AuthenticationInfo) -> None:
+    """Store a successful authentication, never beyond the expiration of the token."""
+    expires_at = _auth_info_expires_at(auth_info)
+    ttl = None
+    if expires_at is not None:
+        ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    _auth_cache.set(key, auth_info, ttl=ttl)
+
+
+async def _run_strategy(key: bytes, token: str) -> AuthenticationInfo:
+    """Validate the token with the configured strategy and cache the result."""
+    auth_info = await _RESOLVED_STRATEGY(token)
+    _cache_auth_info(key, auth_info)
+    return auth_info
+
+
+def _validation_done(key: bytes, task: "asyncio.Task[AuthenticationInfo]") -> None:
+    if _in_flight.get(key) is task:
+        del _in_flight[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every waiter was cancelled
+        task.exception()
+
+
+async def _authenticate(key: bytes, token: str) -> AuthenticationInfo:
+    """
+    Run the authentication strategy, sharing the result with concurrent callers
+
+    The validation runs in its own task, which every caller awaits through a shield,
+    so a cancelled request neither cancels the validation nor fails the requests
+    waiting on it. The check and registration of the in-flight task happen without
+    awaiting, so no lock is needed on the event loop.
+
+    Args:
+        key: The hash of the token
+        token: The bearer token
+
+    Returns:
+        The authentication info of the token
+    """
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_run_strategy(key, token))
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _validation_done(key, done))
+    return await asyncio.shield(task)
+
+
 async def get_auth_info(
     credentials: HTTPAuthorizationCredentials = Security(bearer_scheme),
 ) -> AuthenticationInfo:
     try:
-        strategy_name: str = CONFIG.auth.auth_strategy.upper()
-
-        try:
-            strategy = AuthenticationStrategy[strategy_name]
-        except KeyError:  # If the strategy is not found, we raise an error
-            logger.error(f"Invalid auth strategy: {strategy_name}")
-            raise AuthenticationError(
-                f"Server misconfiguration: invalid auth strategy: {strategy_name}"
-            )
-
-        auth_info = await strategy(credentials.credentials)
-        return auth_info
+        key = token_hash(credentials.credentials)
+        auth_info = _auth_cache.get(key)
+        if auth_info is not None:
+            expires_at = _auth_info_expires_at(auth_info)
+            if expires_at is not None and expires_at < datetime.now(timezone.utc):
+                _auth_cache.pop(key)
+                raise AuthenticationError("Token has expired")
+            return auth_info
+
+        return await _authenticate(key, credentials.credentials)
     except AuthenticationError as e:
         raise e
     except ValueError as e:
@@ -1,5 +1,6 @@
+from datetime import datetime
+
 from pydantic import BaseModel
-from typing import Optional
 from fastapi import HTTPException, status
 from nilai_api.db.users import UserData
 from nilai_api.auth.nuc_helpers.usage import TokenRateLimits, TokenRateLimit
@@ -17,8 +18,10 @@ class AuthenticationError(HTTPException):
 
 class AuthenticationInfo(BaseModel):
     user: UserData
-    token_rate_limit: Optional[TokenRateLimits]
-    prompt_document: Optional[PromptDocument]
+    token_rate_limit: TokenRateLimits | None
+    prompt_document: PromptDocument | None
+    # Earliest expiration of the token and its proofs, None if they never expire
+    expires_at: datetime | None = None
 
 
 __all__ = [
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from nuc.validate import NucTokenValidator, ValidationParameters, InvocationRequirement
 from nuc.envelope import NucTokenEnvelope
 from nuc.token import Did, NucToken, Command
@@ -8,6 +8,7 @@ from nilai_api.state import state
 from nilai_api.auth.common import AuthenticationError
 
 
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
 from nilai_api.auth.nuc_helpers.usage import TokenRateLimits
 from nilai_api.auth.nuc_helpers.nildb_document import PromptDocument
 
@@ -16,6 +17,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 NILAI_BASE_COMMAND: Command = Command.parse("/nil/ai")
+_NILAI_SEGMENTS: Tuple[str, ...] = tuple(NILAI_BASE_COMMAND.segments)
 
 
 @lru_cache(maxsize=1)
@@ -36,6 +38,29 @@ def get_validator() -> NucTokenValidator:
     return NucTokenValidator([])
 
 
+@lru_cache(maxsize=1)
+def get_public_key_bytes() -> bytes:
+    """
+    Get the serialized public key of the Nilai service
+
+    Returns:
+        The serialized public key
+    """
+    return state.public_key.serialize()
+
+
+@lru_cache(maxsize=1)
+def get_public_key_hex() -> str:
+    """
+    Get the public key of the Nilai service in hex format
+
+    Returns:
+        The serialized public key in hex format
+        The key is serialized once to avoid re-serializing it for each request
+    """
+    return get_public_key_bytes().hex()
+
+
 @lru_cache(maxsize=1)
 def get_validation_parameters() -> ValidationParameters:
     """
@@ -46,7 +71,7 @@ def get_validation_parameters() -> ValidationParameters:
     """
     default_parameters = ValidationParameters.default()
     default_parameters.token_requirements = InvocationRequirement(
-        audience=Did(state.public_key.serialize())
+        audience=Did(get_public_key_bytes())
     )
     return default_parameters
 
@@ -56,26 +81,33 @@ def check_is_nilai_subcommand(nuc_token_envelope: NucTokenEnvelope) -> bool:
     Check if the NUC token is a Nilai subcommand
     """
     command: Command = nuc_token_envelope.token.token.command
-    return command.is_attenuation_of(NILAI_BASE_COMMAND)
+    try:
+        segments = command.segments
+    except AttributeError:  # Fall back to the nuc API if the segments are not exposed
+        return command.is_attenuation_of(NILAI_BASE_COMMAND)
+    return tuple(segments[: len(_NILAI_SEGMENTS)]) == _NILAI_SEGMENTS
 
 
-def validate_nuc(nuc_token: str) -> Tuple[str, str]:
+def validate_nuc(nuc_token: Union[str, NucTokenEnvelope]) -> Tuple[str, str]:
     """
     Validate a NUC token
 
     Args:
-        nuc_token: The NUC token to validate
+        nuc_token: The NUC token to validate, serialized or already parsed
 
     Returns:
         The subscription holder and the user that the NUC token is for in hex format (str, str)
     """
-    nuc_token_envelope = NucTokenEnvelope.parse(nuc_token)
-    logger.info(f"Validating NUC token: {nuc_token_envelope.token.token}")
-    logger.info(f"Validation parameters: {get_validation_parameters()}")
-    logger.info(f"Public key: {state.public_key.serialize()}")
+    nuc_token_envelope = (
+        parse_envelope(nuc_token) if isinstance(nuc_token, str) else nuc_token
+    )
+    logger.info("Validating NUC token: %s", nuc_token_envelope.token.token)
+    logger.info("Validation parameters: %s", get_validation_parameters())
+    logger.info("Public key: %s", get_public_key_hex())
     if not check_is_nilai_subcommand(nuc_token_envelope):
         logger.error(
-            f"NUC token namespace is not a /nil/ai attenuation: {nuc_token_envelope.token.token.command}"
+            "NUC token namespace is not a /nil/ai attenuation: %s",
+            nuc_token_envelope.token.token.command,
         )
         raise AuthenticationError("NUC token namespace is not a /nil/ai attenuation")
 
@@ -84,21 +116,23 @@ def validate_nuc(nuc_token: str) -> Tuple[str, str]:
     )
     token: NucToken = nuc_token_envelope.token.token
 
-    # Validate the
     # Return the subject of the token, the subscription holder
-    subscription_holder = token.subject
-    user = token.issuer
-    logger.info(f"Subscription holder: {subscription_holder}")
-    logger.info(f"User: {user}")
-    return str(subscription_holder), str(user)
+    # The DIDs are formatted once and the strings shared with the logs
+    subscription_holder = str(token.subject)
+    user = str(token.issuer)
+    logger.info("Subscription holder: %s", subscription_holder)
+    logger.info("User: %s", user)
+    return subscription_holder, user
 
 
-def get_token_rate_limit(nuc_token: str) -> Optional[TokenRateLimits]:
+def get_token_rate_limit(
+    nuc_token: Union[str, NucTokenEnvelope],
+) -> Optional[TokenRateLimits]:
     """
     Get the rate limit for the NUC token
 
     Args:
-        nuc_token: The NUC token to get the rate limit for
+        nuc_token: The NUC token to get the rate limit for, serialized or already parsed
 
     Returns:
         The rate limit for the NUC token
@@ -106,18 +140,27 @@ def get_token_rate_limit(nuc_token: str) -> Optional[TokenRateLimits]:
     Raises:
         UsageLimitError: If the usage limit is not found or is invalid
     """
-    token_rate_limits = TokenRateLimits.from_token(nuc_token)
-    if not token_rate_limits:
+    token_rate_limits = (
+        TokenRateLimits.from_token(nuc_token)
+        if isinstance(nuc_token, str)
+        else TokenRateLimits.from_envelope(nuc_token)
+    )
+    limits = token_rate_limits.limits if token_rate_limits else None
+    if not limits:
+        # Nothing to enforce, so callers can skip the rate limit lookups
         return None
-    for limit in token_rate_limits.limits:
-        if limit.usage_limit is None:
-            raise AuthenticationError("Token has no usage limit")
-        if limit.expires_at < datetime.now(timezone.utc):
-            raise AuthenticationError("Token has expired")
+    if any(limit.usage_limit is None for limit in limits):
+        raise AuthenticationError("Token has no usage limit")
+    now = datetime.now(timezone.utc)
+    if any(limit.expires_at < now for limit in limits):
+        raise AuthenticationError("Token has expired")
 
     return token_rate_limits
 
 
-def get_token_prompt_document(nuc_token: str) -> Optional[PromptDocument]:
-    prompt_document = PromptDocument.from_token(nuc_token)
-    return prompt_document
+def get_token_prompt_document(
+    nuc_token: Union[str, NucTokenEnvelope],
+) -> Optional[PromptDocument]:
+    if isinstance(nuc_token, str):
+        return PromptDocument.from_token(nuc_token)
+    return PromptDocument.from_envelope(nuc_token)
@@ -6,6 +6,7 @@ from nilai_api.auth.nuc_helpers.helpers import (
     get_invocation_token,
     get_nilai_public_key,
     get_nilauth_public_key,
+    clear_nilauth_key_cache,
     validate_token,
 )
 from cosmpy.crypto.keypairs import PrivateKey as NilchainPrivateKey
@@ -24,6 +25,7 @@ __all__ = [
     "get_invocation_token",
     "get_nilai_public_key",
     "get_nilauth_public_key",
+    "clear_nilauth_key_cache",
     "validate_token",
     "NilAuthPublicKey",
     "NilAuthPrivateKey",
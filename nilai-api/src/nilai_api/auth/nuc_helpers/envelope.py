@@ -0,0 +1,20 @@
+from nuc.envelope import NucTokenEnvelope
+
+from nilai_api.cache import token_cache
+
+
+@token_cache(maxsize=1024)
+def parse_envelope(token: str) -> NucTokenEnvelope:
+    """
+    Parse a serialized NUC token, reusing the envelope of previous parses of the same token.
+
+    The envelope is shared between callers and must not be mutated.
+    If you need to invalidate the cache, call `parse_envelope.cache_clear()`.
+
+    Args:
+        token (str): The serialized NUC token.
+
+    Returns:
+        NucTokenEnvelope: The parsed token envelope.
+    """
+    return NucTokenEnvelope.parse(token)
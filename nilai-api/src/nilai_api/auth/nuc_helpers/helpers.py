@@ -1,5 +1,6 @@
 import base64
 import datetime
+import functools
 import logging
 from typing import Tuple
 import httpx
@@ -30,6 +31,39 @@ from cosmpy.aerial.client import LedgerClient, NetworkConfig
 
 logger = logging.getLogger(__name__)
 
+_PRIVATE_KEY_SIZE = 32
+_UTC = datetime.timezone.utc
+_DEFAULT_DELEGATION_LIFETIME = datetime.timedelta(minutes=5)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by the helpers
+
+    Returns:
+        An httpx client whose connection pool is reused across calls
+    """
+    return httpx.Client(timeout=5.0)
+
+
+def _nilauth_private_key(keypair: NilchainPrivateKey) -> NilAuthPrivateKey:
+    """
+    Build the nilauth private key from the raw bytes of a nilchain keypair
+
+    Args:
+        keypair: The keypair of the wallet
+
+    Returns:
+        The private key of the keypair to use for nilauth
+    """
+    raw = keypair.private_key_bytes
+    if len(raw) != _PRIVATE_KEY_SIZE:
+        raise ValueError(
+            f"Invalid private key length: expected {_PRIVATE_KEY_SIZE} bytes, got {len(raw)}"
+        )
+    return NilAuthPrivateKey(raw)
+
 
 def get_wallet_and_private_key_from_mnemonic(
     mnemonic: str,
@@ -47,8 +81,8 @@ def get_wallet_and_private_key_from_mnemonic(
     """
 
     wallet = LocalWallet.from_mnemonic(mnemonic, prefix="nillion")
-    keypair = NilchainPrivateKey(base64.b64decode(wallet.signer().private_key))
-    private_key = NilAuthPrivateKey(base64.b64decode(keypair.private_key))
+    keypair = wallet.signer()
+    private_key = _nilauth_private_key(keypair)
     return wallet, keypair, private_key
 
 
@@ -69,7 +103,7 @@ def get_wallet_and_private_key(
     """
     keypair = NilchainPrivateKey(private_key_bytes)
     wallet = LocalWallet(keypair, prefix="nillion")
-    private_key = NilAuthPrivateKey(base64.b64decode(keypair.private_key))
+    private_key = _nilauth_private_key(keypair)
     return wallet, keypair, private_key
 
 
@@ -96,10 +130,33 @@ def get_root_token(
     return RootToken(token=root_token)
 
 
+@functools.lru_cache(maxsize=8)
+def _get_ledger_client(grpc_endpoint: str, chain_id: ChainId) -> LedgerClient:
+    """
+    Get a ledger client for the nilchain, reusing its gRPC channel across calls
+
+    Args:
+        grpc_endpoint: The endpoint of the grpc server
+        chain_id: The chain id of the nilchain
+
+    Returns:
+        The ledger client, cached per endpoint and chain id
+    """
+    cfg = NetworkConfig(
+        chain_id=chain_id.value,
+        url="grpc+" + grpc_endpoint,
+        fee_minimum_gas_price=1,
+        fee_denomination="unil",
+        staking_denomination="unil",
+    )
+    return LedgerClient(cfg)
+
+
 def get_unil_balance(
     address: Address,
     grpc_endpoint: str,
     chain_id: ChainId = ChainId.NILLION_CHAIN_DEVNET,
+    ledger_client: LedgerClient | None = None,
 ) -> int:
     """
     Get the UNIL balance of the user
@@ -108,18 +165,13 @@ def get_unil_balance(
         address: The address of the user
         grpc_endpoint: The endpoint of the grpc server
         chain_id: The chain id of the nilchain (default is devnet)
+        ledger_client: The ledger client to use (default is a cached client for the endpoint)
 
     Returns:
         The balance of the user in UNIL
     """
-    cfg = NetworkConfig(
-        chain_id=chain_id.value,
-        url="grpc+" + grpc_endpoint,
-        fee_minimum_gas_price=1,
-        fee_denomination="unil",
-        staking_denomination="unil",
-    )
-    ledger_client = LedgerClient(cfg)
+    if ledger_client is None:
+        ledger_client = _get_ledger_client(grpc_endpoint, chain_id)
     balance = ledger_client.query_bank_balance(address, "unil")  # type: ignore
     return balance
 
@@ -144,16 +196,9 @@ def pay_for_subscription(
         chain_id: The chain id of the nilchain (default is devnet)
     """
 
-    payer = Payer(
-        wallet_private_key=keypair,
-        chain_id=chain_id.value,
-        grpc_endpoint=grpc_endpoint,
-        gas_limit=1000000000000,
-    )
-
     # Pretty print the subscription details
     subscription_details = nilauth_client.subscription_status(public_key, blind_module)
-    logger.info(f"IS SUBSCRIBED: {subscription_details.subscribed}")
+    logger.info("IS SUBSCRIBED: %s", subscription_details.subscribed)
     if not subscription_details or subscription_details.subscribed is None:
         raise RuntimeError(
             f"User subscription details could not be retrieved: {subscription_details}, {subscription_details.subscribed}, {subscription_details.details}"
@@ -167,6 +212,13 @@ def pay_for_subscription(
                 "User does not have enough UNIL to pay for the subscription"
             )
         logger.info("[>] Paying for subscription")
+        # The payer opens its own gRPC channel, so it is only built when paying
+        payer = Payer(
+            wallet_private_key=keypair,
+            chain_id=chain_id.value,
+            grpc_endpoint=grpc_endpoint,
+            gas_limit=1000000000000,
+        )
         nilauth_client.pay_subscription(
             pubkey=public_key,
             payer=payer,
@@ -180,11 +232,10 @@ def pay_for_subscription(
                 f"Subscription details could not be retrieved: {subscription_details}"
             )
 
+        now = datetime.datetime.now(_UTC)
+        logger.info("EXPIRES IN: %s", subscription_details.details.expires_at - now)
         logger.info(
-            f"EXPIRES IN: {subscription_details.details.expires_at - datetime.datetime.now(datetime.timezone.utc)}"
-        )
-        logger.info(
-            f"CAN BE RENEWED IN: {subscription_details.details.renewable_at - datetime.datetime.now(datetime.timezone.utc)}"
+            "CAN BE RENEWED IN: %s", subscription_details.details.renewable_at - now
         )
 
 
@@ -216,10 +267,7 @@ def get_delegation_token(
     delegated_token = (
         NucTokenBuilder.extending(root_token_envelope)
         .expires_at(
-            expires_at
-            if expires_at
-            else datetime.datetime.now(datetime.timezone.utc)
-            + datetime.timedelta(minutes=5)
+            expires_at or datetime.datetime.now(_UTC) + _DEFAULT_DELEGATION_LIFETIME
         )
         .audience(Did(user_public_key.serialize()))
         .command(Command(["nil", "ai", "generate"]))
@@ -235,19 +283,22 @@ def get_delegation_token(
     return DelegationToken(token=delegated_token)
 
 
+@functools.lru_cache(maxsize=16)
 def get_nilai_public_key(nilai_url: str) -> NilAuthPublicKey:
     """
     Get the nilai public key from the nilai server
 
+    The key is cached per URL, call `get_nilai_public_key.cache_clear()` after a key rotation.
+
     Args:
         nilai_url: The URL of the nilai server
 
     Returns:
         The nilai public key
     """
-    response = httpx.get(f"{nilai_url}/v1/public_key")
+    response = _get_http_client().get(f"{nilai_url}/v1/public_key")
     public_key = NilAuthPublicKey(base64.b64decode(response.text), raw=True)
-    logger.info(f"Nilai public key: {public_key.serialize().hex()}")
+    logger.info("Nilai public key: %s", public_key.serialize().hex())
     return public_key
 
 
@@ -275,10 +326,13 @@ def get_invocation_token(
     return InvocationToken(token=invocation)
 
 
+@functools.lru_cache(maxsize=8)
 def get_nilauth_public_key(nilauth_url: str) -> Did:
     """
     Get the nilauth public key from the nilauth server
 
+    The key is cached per URL, call `get_nilauth_public_key.cache_clear()` after a key rotation.
+
     Args:
         nilauth_url: The URL of the nilauth server
 
@@ -290,6 +344,26 @@ def get_nilauth_public_key(nilauth_url: str) -> Did:
     return nilauth_public_key
 
 
+@functools.lru_cache(maxsize=8)
+def _get_validator_for(nilauth_url: str) -> NucTokenValidator:
+    """
+    Get a validator trusting the nilauth server as root issuer
+
+    Args:
+        nilauth_url: The URL of the nilauth server
+
+    Returns:
+        The validator, cached per URL
+    """
+    return NucTokenValidator([get_nilauth_public_key(nilauth_url)])
+
+
+def clear_nilauth_key_cache() -> None:
+    """Forget the cached nilauth public keys and validators, e.g. after a key rotation."""
+    _get_validator_for.cache_clear()
+    get_nilauth_public_key.cache_clear()
+
+
 def validate_token(
     nilauth_url: str, token: str, validation_parameters: ValidationParameters
 ):
@@ -301,6 +375,6 @@ def validate_token(
         validation_parameters: The validation parameters
     """
     token_envelope = NucTokenEnvelope.parse(token)
-    validator = NucTokenValidator([get_nilauth_public_key(nilauth_url)])
+    validator = _get_validator_for(nilauth_url)
 
     validator.validate(token_envelope, context={}, parameters=validation_parameters)
@@ -6,15 +6,24 @@ from pydantic import BaseModel
 
 from nuc.token import Did
 
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
+from nilai_api.cache import token_cache
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _parse_did(did: str) -> Did:
+    """Parse a DID string, caching the result as there are few distinct document owners."""
+    return Did.parse(did)
+
+
 class PromptDocument(BaseModel):
     document_id: str
     owner_did: str
 
     @staticmethod
-    @lru_cache(maxsize=128)
+    @token_cache(maxsize=4096)
     def from_token(token: str) -> Optional["PromptDocument"]:
         """
         Extracts the prompt_document_id from the NUC token if there is one.
@@ -29,10 +38,10 @@ class PromptDocument(BaseModel):
         - The uppermost token containing a `document_id` in their metadata is the one considered.
         - If two `document_id` are present, only the uppermost in the chain is considered.
 
-        The function is cached based on the token string to avoid redundant parsing and validation.
+        The function is cached based on the token hash to avoid redundant parsing and validation.
 
         Note: This function is cached, so it will return the same result for the same token string.
-        If you need to invalidate the cache, call `get_usage_limit.cache_clear()`.
+        If you need to invalidate the cache, call `PromptDocument.from_token.cache_clear()`.
 
 
         Args:
@@ -41,24 +50,42 @@ class PromptDocument(BaseModel):
         Returns:
             PromptDocumentId: The document_id and the issuer did to be matched to the database
         """
-        token_envelope = NucTokenEnvelope.parse(token)
+        return PromptDocument.from_envelope(parse_envelope(token))
+
+    @staticmethod
+    def from_envelope(token_envelope: NucTokenEnvelope) -> Optional["PromptDocument"]:
+        """
+        Extracts the prompt_document_id from an already parsed NUC token envelope if there is one.
+
+        See `PromptDocument.from_token` for the rules applied to the proof chain.
+
+        Args:
+            token_envelope (NucTokenEnvelope): The parsed delegation token.
+
+        Returns:
+            PromptDocumentId: The document_id and the issuer did to be matched to the database
+        """
+        if not token_envelope.proofs:
+            return None
 
         # Iterate over proofs and collect the first document_id found together with issuer.
-        for i, proof in enumerate(token_envelope.proofs[::-1]):
+        for i, proof in enumerate(reversed(token_envelope.proofs)):
             meta = proof.token.meta if proof.token else None
-            logger.debug(f"Proof {i} meta: {meta}")
-            if (
-                meta is not None
-                and meta.get("document_id", None) is not None
-                and meta.get("document_owner_did", None) is not None
-            ):
-                if Did.parse(meta["document_owner_did"]) != proof.token.issuer:
-                    raise ValueError(
-                        f"Document owner DID {meta['document_owner_did']} does not match issuer {proof.token.issuer}"
-                    )
-                return PromptDocument(
-                    document_id=meta["document_id"],
-                    owner_did=meta["document_owner_did"],
+            logger.debug("Proof %d meta: %s", i, meta)
+            if meta is None:
+                continue
+            # Read each field once instead of checking and then indexing the dict
+            document_id = meta.get("document_id")
+            document_owner_did = meta.get("document_owner_did")
+            if document_id is None or document_owner_did is None:
+                continue
+            if _parse_did(document_owner_did) != proof.token.issuer:
+                raise ValueError(
+                    f"Document owner DID {document_owner_did} does not match issuer {proof.token.issuer}"
                 )
+            return PromptDocument(
+                document_id=document_id,
+                owner_did=document_owner_did,
+            )
 
         return None
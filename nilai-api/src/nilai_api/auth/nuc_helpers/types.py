@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from enum import StrEnum
 
 
@@ -16,21 +16,33 @@ class ChainId(StrEnum):
     NILLION_CHAIN_DEVNET = "nillion-chain-devnet"
 
 
+# The token wrappers are created from already validated data and never mutated
+_TOKEN_CONFIG = ConfigDict(frozen=True, extra="forbid")
+
+
 class PrivateKey(BaseModel):
+    model_config = _TOKEN_CONFIG
+
     type: TokenType = TokenType.PRIVATE_KEY
     token: str
 
 
 class RootToken(BaseModel):
+    model_config = _TOKEN_CONFIG
+
     type: TokenType = TokenType.ROOT
     token: str
 
 
 class DelegationToken(BaseModel):
+    model_config = _TOKEN_CONFIG
+
     type: TokenType = TokenType.DELEGATION
     token: str
 
 
 class InvocationToken(BaseModel):
+    model_config = _TOKEN_CONFIG
+
     type: TokenType = TokenType.INVOCATION
     token: str
@@ -1,26 +1,48 @@
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from functools import lru_cache
-from typing import Optional, List
+from typing import Annotated, Dict, Optional, List
+import time
 from nuc.envelope import NucTokenEnvelope
 from enum import Enum
 import logging
-from pydantic import BaseModel, Field
+from pydantic import Field
+
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
+from nilai_api.cache import token_cache
 
 logger = logging.getLogger(__name__)
 
+# How far in the past a limit without expiration is placed, so it is treated as expired
+_EXPIRED_FALLBACK_DELTA = timedelta(days=1)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
 
-class TokenRateLimit(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class TokenRateLimit:
     signature: str
     expires_at: datetime
     usage_limit: Optional[int]
 
+    # The expiration as a POSIX timestamp in milliseconds, computed once per instance
+    # and excluded when the limit is serialized as part of a pydantic model
+    _expires_at_ms: Annotated[Optional[int], Field(exclude=True)] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.expires_at is not None:
+            object.__setattr__(
+                self, "_expires_at_ms", int(self.expires_at.timestamp() * 1000)
+            )
+
     @property
     def ms_remaining(self) -> int:
-        if self.expires_at is None:
+        if self._expires_at_ms is None:
             return 0  # Or handle as infinite, e.g., float('inf'), or raise error
-        return int(
-            (self.expires_at - datetime.now(timezone.utc)).total_seconds() * 1000
-        )
+        return self._expires_at_ms - _now_ms()
 
 
 class UsageLimitKind(Enum):
@@ -38,13 +60,21 @@ class UsageLimitError(Exception):
         self.kind = kind
 
 
-def is_reduction_of(base: int, reduced: int) -> bool:
-    """Check if `reduced` is a valid reduction of `base`."""
-    return 0 < reduced <= base
+@dataclass(slots=True, frozen=True)
+class TokenRateLimits:
+    limits: List[TokenRateLimit] = field(default_factory=list)
 
+    # Index of the limits by signature, built once per instance
+    _index: Annotated[Dict[str, TokenRateLimit], Field(exclude=True)] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
 
-class TokenRateLimits(BaseModel):
-    limits: List[TokenRateLimit] = Field(default_factory=list, min_length=1)
+    def __post_init__(self) -> None:
+        if len(self.limits) == 0:
+            raise ValueError("TokenRateLimits requires at least one limit")
+        # Keep the first limit of a signature, as the linear scan did
+        for limit in reversed(self.limits):
+            self._index[limit.signature] = limit
 
     @property
     def last(self) -> TokenRateLimit:
@@ -53,13 +83,10 @@ class TokenRateLimits(BaseModel):
         return self.limits[-1]
 
     def get_limit(self, signature: str) -> Optional[TokenRateLimit]:
-        for limit in self.limits:
-            if limit.signature == signature:
-                return limit
-        return None
+        return self._index.get(signature)
 
     @staticmethod
-    @lru_cache(maxsize=128)
+    @token_cache(maxsize=1024)
     def from_token(token: str) -> Optional["TokenRateLimits"]:
         """
         Extracts the effective usage limits from a valid NUC delegation token proof chain, ensuring consistency across proofs.
@@ -75,10 +102,10 @@ class TokenRateLimits(BaseModel):
         - If the invocation token includes a `usage_limit`, it is ignored.
         - If no usage limits are found in either proofs or invocation, the function returns `None`.
 
-        The function is cached based on the token string to avoid redundant parsing and validation.
+        The function is cached based on the token hash to avoid redundant parsing and validation.
 
         Note: This function is cached, so it will return the same result for the same token string.
-        If you need to invalidate the cache, call `get_usage_limit.cache_clear()`.
+        If you need to invalidate the cache, call `TokenRateLimits.from_token.cache_clear()`.
 
 
         Args:
@@ -90,28 +117,51 @@ class TokenRateLimits(BaseModel):
         Raises:
             UsageLimitInconsistencyError: If usage limits across proofs or invocation are inconsistent.
         """
-        token_envelope = NucTokenEnvelope.parse(token)
+        return TokenRateLimits.from_envelope(parse_envelope(token))
+
+    @staticmethod
+    def from_envelope(
+        token_envelope: NucTokenEnvelope,
+    ) -> Optional["TokenRateLimits"]:
+        """
+        Extracts the effective usage limits from an already parsed NUC token envelope.
+
+        See `TokenRateLimits.from_token` for the rules applied to the proof chain.
 
+        Args:
+            token_envelope (NucTokenEnvelope): The parsed delegation token.
+
+        Returns:
+            TokenRateLimits: The usage limits of the token, or `None` if no usage limit is found.
+
+        Raises:
+            UsageLimitInconsistencyError: If usage limits across proofs or invocation are inconsistent.
+        """
         usage_limits = []
+        # Shared by every proof without expiration, computed on first use
+        expired_fallback: Optional[datetime] = None
 
         # Iterate over proofs and collect usage limits from the root token -> last delegation token
-        for i, proof in enumerate(token_envelope.proofs[::-1]):
+        for i, proof in enumerate(reversed(token_envelope.proofs)):
             meta = proof.token.meta if proof.token else None
-            logger.info(f"Proof {i} meta: {meta}")
+            logger.debug("Proof %d meta: %s", i, meta)
             if meta and "usage_limit" in meta and meta["usage_limit"] is not None:
                 token_usage_limit = meta["usage_limit"]
-                logger.info(f"Proof {i} usage limit: {token_usage_limit}")
+                logger.debug("Proof %d usage limit: %s", i, token_usage_limit)
                 if not isinstance(token_usage_limit, int):
                     logger.error(
-                        f"Proof {i} has invalid usage limit type: {type(token_usage_limit)} and value: {token_usage_limit}."
+                        "Proof %d has invalid usage limit type: %s and value: %s.",
+                        i,
+                        type(token_usage_limit),
+                        token_usage_limit,
                     )
                     raise UsageLimitError(
                         UsageLimitKind.INVALID_TYPE,
                         f"Proof {i} has invalid usage limit type: {type(token_usage_limit)} and value: {token_usage_limit}.",
                     )
                 # We have a usage limit, we need to check if it is a reduction of the previous usage limit
-                if len(usage_limits) > 0 and not is_reduction_of(
-                    usage_limits[-1].usage_limit, token_usage_limit
+                if usage_limits and not (
+                    0 < token_usage_limit <= usage_limits[-1].usage_limit
                 ):
                     error_message = f"Inconsistent usage limit: {token_usage_limit} is not a reduction of {usage_limits[-1].usage_limit}"
                     logger.error(error_message)
@@ -119,13 +169,16 @@ class TokenRateLimits(BaseModel):
                         UsageLimitKind.INCONSISTENT,
                         error_message,
                     )
-                logger.info(f"Usage limit updated to: {token_usage_limit}")
+                logger.debug("Usage limit updated to: %s", token_usage_limit)
                 sig = proof.signature.hex()
-                expires_at = (
-                    proof.token.expires_at
-                    if proof.token.expires_at is not None
-                    else datetime.now(timezone.utc) - timedelta(days=1)
-                )  # Set to a past date to indicate that the token is expired and invalid
+                expires_at = proof.token.expires_at
+                if expires_at is None:
+                    # Set to a past date to indicate that the token is expired and invalid
+                    if expired_fallback is None:
+                        expired_fallback = (
+                            datetime.now(timezone.utc) - _EXPIRED_FALLBACK_DELTA
+                        )
+                    expires_at = expired_fallback
                 usage_limits.append(
                     TokenRateLimit(
                         signature=sig,
@@ -134,6 +187,6 @@ class TokenRateLimits(BaseModel):
                     )
                 )
 
-        if len(usage_limits) == 0:
+        if not usage_limits:
             return None
         return TokenRateLimits(limits=usage_limits)
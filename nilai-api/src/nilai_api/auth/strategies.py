@@ -1,7 +1,13 @@
-from typing import Callable, Awaitable, Optional
+import hmac
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Awaitable, Mapping, Optional, Tuple, Union
 
 from fastapi import HTTPException
 from nilai_api.db.users import UserManager, UserModel, UserData
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
+from nuc.envelope import NucTokenEnvelope
+from nilai_api.cache import TTLCache, token_hash
 from nilai_api.auth.nuc import (
     validate_nuc,
     get_token_rate_limit,
@@ -20,10 +26,8 @@ from nilauth_credit_middleware import (
 )
 from nilauth_credit_middleware.api_model import ValidateCredentialResponse
 
-
-from enum import Enum
-
 # All strategies must return a UserModel
+# The AuthenticationInfo is built with model_construct, as its fields are already validated models
 # The strategies can raise any exception, which will be caught and converted to an AuthenticationError
 # The exception detail will be passed to the client
 
@@ -46,20 +50,23 @@ def allow_token(
         if allowed_token is None:
             return function
 
-        async def wrapper(token) -> AuthenticationInfo:
-            if allowed_token is None:
-                return await function(token)
-
-            if token == allowed_token:
-                user_model = UserModel(
+        # Compare as bytes, compare_digest only accepts ASCII strings
+        allowed_token_bytes = allowed_token.encode()
+        # The bypass authentication is the same for every request, so it is built once
+        bypass_info = AuthenticationInfo.model_construct(
+            user=UserData.from_sqlalchemy(
+                UserModel(
                     user_id=allowed_token,
                     rate_limits=None,
                 )
-                return AuthenticationInfo(
-                    user=UserData.from_sqlalchemy(user_model),
-                    token_rate_limit=None,
-                    prompt_document=None,
-                )
+            ),
+            token_rate_limit=None,
+            prompt_document=None,
+        )
+
+        async def wrapper(token) -> AuthenticationInfo:
+            if hmac.compare_digest(token.encode(), allowed_token_bytes):
+                return bypass_info
             return await function(token)
 
         return wrapper
@@ -67,10 +74,28 @@ def allow_token(
     return decorator
 
 
+# Results of the credit middleware keyed by (credential hash, is_public).
+# Valid credentials are reused for CREDENTIAL_CACHE_TTL_SECONDS, and credentials that
+# are not found or inactive are rejected for CREDENTIAL_NEGATIVE_CACHE_TTL_SECONDS.
+CREDENTIAL_CACHE_MAXSIZE = 4096
+CREDENTIAL_CACHE_TTL_SECONDS = 30.0
+CREDENTIAL_NEGATIVE_CACHE_TTL_SECONDS = 5.0
+_credential_cache: TTLCache[
+    Tuple[bytes, bool], Union[UserModel, AuthenticationError]
+] = TTLCache(maxsize=CREDENTIAL_CACHE_MAXSIZE, ttl=CREDENTIAL_CACHE_TTL_SECONDS)
+
+
 async def validate_credential(credential: str, is_public: bool) -> UserModel:
     """
     Validate a credential with nilauth credit middleware and return the user model
     """
+    key = (token_hash(credential), is_public)
+    cached = _credential_cache.get(key)
+    if isinstance(cached, AuthenticationError):
+        raise AuthenticationError(cached.detail)
+    if cached is not None:
+        return cached
+
     credit_client = CreditClientSingleton.get_client()
     try:
         validate_response: ValidateCredentialResponse = (
@@ -78,11 +103,13 @@ async def validate_credential(credential: str, is_public: bool) -> UserModel:
         )
     except HTTPException as e:
         if e.status_code == 404:
-            raise AuthenticationError(f"Credential not found: {e.detail}")
+            error = AuthenticationError(f"Credential not found: {e.detail}")
         elif e.status_code == 401:
-            raise AuthenticationError(f"Credential is inactive: {e.detail}")
+            error = AuthenticationError(f"Credential is inactive: {e.detail}")
         else:
             raise AuthenticationError(f"Failed to validate credential: {e.detail}")
+        _credential_cache.set(key, error, ttl=CREDENTIAL_NEGATIVE_CACHE_TTL_SECONDS)
+        raise error
 
     user_model = await UserManager.check_user(validate_response.user_id)
     if user_model is None:
@@ -90,6 +117,7 @@ async def validate_credential(credential: str, is_public: bool) -> UserModel:
             user_id=validate_response.user_id,
             rate_limits=None,
         )
+    _credential_cache.set(key, user_model)
     return user_model
 
 
@@ -97,36 +125,56 @@ async def validate_credential(credential: str, is_public: bool) -> UserModel:
 async def api_key_strategy(api_key: str) -> AuthenticationInfo:
     user_model = await validate_credential(api_key, is_public=False)
 
-    return AuthenticationInfo(
+    return AuthenticationInfo.model_construct(
         user=UserData.from_sqlalchemy(user_model),
         token_rate_limit=None,
         prompt_document=None,
     )
 
 
+def _envelope_expires_at(token_envelope: NucTokenEnvelope) -> Optional[datetime]:
+    """Get the earliest expiration date of a NUC token and its proofs, if any."""
+    expirations = [
+        token.token.expires_at
+        for token in (token_envelope.token, *token_envelope.proofs)
+        if token.token.expires_at is not None
+    ]
+    return min(expirations) if expirations else None
+
+
 @allow_token(CONFIG.docs.token)
 async def nuc_strategy(nuc_token) -> AuthenticationInfo:
     """
     Validate a NUC token and return the user model
     """
-    subscription_holder, user = validate_nuc(nuc_token)
-    token_rate_limits: Optional[TokenRateLimits] = get_token_rate_limit(nuc_token)
-    prompt_document: Optional[PromptDocument] = get_token_prompt_document(nuc_token)
+    # Parse the token once and share the envelope between the validation steps
+    nuc_token_envelope = parse_envelope(nuc_token)
+    subscription_holder, user = validate_nuc(nuc_token_envelope)
+    token_rate_limits: Optional[TokenRateLimits] = get_token_rate_limit(
+        nuc_token_envelope
+    )
+    prompt_document: Optional[PromptDocument] = get_token_prompt_document(
+        nuc_token_envelope
+    )
 
     user_model = await validate_credential(subscription_holder, is_public=True)
-    return AuthenticationInfo(
+    return AuthenticationInfo.model_construct(
         user=UserData.from_sqlalchemy(user_model),
         token_rate_limit=token_rate_limits,
         prompt_document=prompt_document,
+        expires_at=_envelope_expires_at(nuc_token_envelope),
     )
 
 
-class AuthenticationStrategy(Enum):
-    API_KEY = (api_key_strategy, "API Key")
-    NUC = (nuc_strategy, "NUC")
-
-    async def __call__(self, *args, **kwargs) -> AuthenticationInfo:
-        return await self.value[0](*args, **kwargs)
+# Authentication strategies by configuration name (CONFIG.auth.auth_strategy)
+STRATEGIES: Mapping[str, Callable[[str], Awaitable[AuthenticationInfo]]] = (
+    MappingProxyType(
+        {
+            "api_key": api_key_strategy,
+            "nuc": nuc_strategy,
+        }
+    )
+)
 
 
-__all__ = ["AuthenticationStrategy"]
+__all__ = ["STRATEGIES"]
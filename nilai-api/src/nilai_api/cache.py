@@ -0,0 +1,156 @@
+import functools
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+V_co = TypeVar("V_co", covariant=True)
+D = TypeVar("D")
+
+
+def token_hash(token: str) -> bytes:
+    """
+    Compute a short fixed-size digest of a token to be used as a cache key.
+
+    Caches keyed by the digest do not keep the raw bearer token in memory, and
+    lookups hash 16 bytes instead of a multi-kilobyte token string.
+
+    Args:
+        token: The token to hash
+
+    Returns:
+        The 16 byte BLAKE2b digest of the token
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A bounded in-process cache whose entries expire after a time to live.
+
+    When the cache is full, the least recently used entry is evicted.
+    The cache is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize: The maximum number of entries
+            ttl: The default time to live of the entries in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, default: D = None) -> Union[V, D]:
+        """
+        Get a value from the cache
+
+        Args:
+            key: The key of the entry
+            default: The value returned when the key is missing or has expired
+
+        Returns:
+            The cached value, or the default if the key is missing or has expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        deadline, value = entry
+        if time.monotonic() >= deadline:
+            self._entries.pop(key, None)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: The key of the entry
+            value: The value to store
+            ttl: The time to live of the entry in seconds, defaults to the cache TTL
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove an entry from the cache, returning its value if it was present."""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        self._entries.clear()
+
+
+_MISSING = object()
+
+
+class TokenCachedFunction(Protocol[V_co]):
+    """A function of a token decorated with `token_cache`."""
+
+    cache: TTLCache[bytes, Any]
+
+    def __call__(self, token: str) -> V_co: ...
+
+    def cache_clear(self) -> None: ...
+
+
+def token_cache(
+    maxsize: int, ttl: float = math.inf
+) -> Callable[[Callable[[str], V]], TokenCachedFunction[V]]:
+    """
+    Decorator caching the result of a function of a token by the token hash
+
+    Unlike `functools.lru_cache`, the cache does not keep the token string alive and
+    looks entries up by a 16 byte digest. Exceptions are not cached.
+    The decorated function exposes `cache_clear()` like `functools.lru_cache`.
+
+    Args:
+        maxsize: The maximum number of cached results
+        ttl: The time to live of the cached results in seconds
+    """
+
+    def decorator(function: Callable[[str], V]) -> TokenCachedFunction[V]:
+        cache: TTLCache[bytes, V] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(function)
+        def wrapper(token: str) -> V:
+            key = token_hash(token)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = function(token)
+                cache.set(key, value)
+                return value
+            return cast(V, value)
+
+        cached = cast(TokenCachedFunction[V], wrapper)
+        cached.cache = cache
+        cached.cache_clear = cache.clear
+        return cached
+
+    return decorator
@@ -44,17 +44,19 @@ def main(
                 web_search_rate_limit_minute=web_search_ratelimit_minute,
             ),
         )
+        # rate_limits_obj rebuilds the effective limits on each access
+        rate_limits = user.rate_limits_obj
         json_user = json.dumps(
             {
                 "user_id": user.user_id,
                 "name": user.name,
                 "apikey": user.apikey,
-                "ratelimit_day": user.rate_limits_obj.user_rate_limit_day,
-                "ratelimit_hour": user.rate_limits_obj.user_rate_limit_hour,
-                "ratelimit_minute": user.rate_limits_obj.user_rate_limit_minute,
-                "web_search_ratelimit_day": user.rate_limits_obj.web_search_rate_limit_day,
-                "web_search_ratelimit_hour": user.rate_limits_obj.web_search_rate_limit_hour,
-                "web_search_ratelimit_minute": user.rate_limits_obj.web_search_rate_limit_minute,
+                "ratelimit_day": rate_limits.user_rate_limit_day,
+                "ratelimit_hour": rate_limits.user_rate_limit_hour,
+                "ratelimit_minute": rate_limits.user_rate_limit_minute,
+                "web_search_ratelimit_day": rate_limits.web_search_rate_limit_day,
+                "web_search_ratelimit_hour": rate_limits.web_search_rate_limit_hour,
+                "web_search_ratelimit_minute": rate_limits.web_search_rate_limit_minute,
             },
             indent=4,
         )
@@ -1,59 +1,77 @@
 # Import all configuration models
 import json
+import os
+import re
+from typing import Any, Dict
 from .environment import EnvironmentConfig
 from .database import DatabaseConfig, DiscoveryConfig, RedisConfig
 from .auth import AuthConfig, DocsConfig
 from .nildb import NilDBConfig
+from .embeddings import EmbeddingsConfig
 from .web_search import WebSearchSettings
 from .rate_limiting import RateLimitingConfig
-from .utils import create_config_model, CONFIG_DATA
+from .utils import resolve_model, CONFIG_DATA
 from pydantic import BaseModel
 import logging
 
+# Keys whose values are masked when printing the configuration
+SENSITIVE_KEYS = re.compile(r"pass|token|key", re.IGNORECASE)
+_is_sensitive = SENSITIVE_KEYS.search
+MASK = "***************"
+
+
+def _mask_sensitive(config_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Mask the values of sensitive keys in place, recursing into nested sections."""
+    for key, value in config_dict.items():
+        if isinstance(value, dict):
+            _mask_sensitive(value)
+        elif value is not None and _is_sensitive(key):
+            config_dict[key] = MASK
+    return config_dict
+
+
+# The environment is read once and shared by all the configuration sections
+_ENVIRON: Dict[str, str] = dict(os.environ)
+
+
+def _section(name: str) -> Dict[str, Any]:
+    """Get a top-level section of the YAML configuration."""
+    return CONFIG_DATA.get(name) or {}
+
 
 class NilAIConfig(BaseModel):
     """Centralized configuration container for the Nilai API."""
 
-    environment: EnvironmentConfig = create_config_model(
-        EnvironmentConfig, "", CONFIG_DATA
+    environment: EnvironmentConfig = resolve_model(
+        EnvironmentConfig, _section(""), _ENVIRON
+    )
+    database: DatabaseConfig = resolve_model(
+        DatabaseConfig, _section("database"), _ENVIRON, "POSTGRES_"
     )
-    database: DatabaseConfig = create_config_model(
-        DatabaseConfig, "database", CONFIG_DATA, "POSTGRES_"
+    discovery: DiscoveryConfig = resolve_model(
+        DiscoveryConfig, _section("discovery"), _ENVIRON, "DISCOVERY_"
     )
-    discovery: DiscoveryConfig = create_config_model(
-        DiscoveryConfig, "discovery", CONFIG_DATA, "DISCOVERY_"
+    redis: RedisConfig = resolve_model(
+        RedisConfig, _section("redis"), _ENVIRON, "REDIS_"
     )
-    redis: RedisConfig = create_config_model(
-        RedisConfig, "redis", CONFIG_DATA, "REDIS_"
+    auth: AuthConfig = resolve_model(AuthConfig, _section("auth"), _ENVIRON)
+    docs: DocsConfig = resolve_model(DocsConfig, _section("docs"), _ENVIRON, "DOCS_")
+    web_search: WebSearchSettings = resolve_model(
+        WebSearchSettings, _section("web_search"), _ENVIRON, "WEB_SEARCH_"
     )
-    auth: AuthConfig = create_config_model(AuthConfig, "auth", CONFIG_DATA)
-    docs: DocsConfig = create_config_model(DocsConfig, "docs", CONFIG_DATA, "DOCS_")
-    web_search: WebSearchSettings = create_config_model(
-        WebSearchSettings, "web_search", CONFIG_DATA, "WEB_SEARCH_"
+    rate_limiting: RateLimitingConfig = resolve_model(
+        RateLimitingConfig, _section("rate_limiting"), _ENVIRON
     )
-    rate_limiting: RateLimitingConfig = create_config_model(
-        RateLimitingConfig, "rate_limiting", CONFIG_DATA
+    nildb: NilDBConfig = resolve_model(
+        NilDBConfig, _section("nildb"), _ENVIRON, "NILDB_"
     )
-    nildb: NilDBConfig = create_config_model(
-        NilDBConfig, "nildb", CONFIG_DATA, "NILDB_"
+    embeddings: EmbeddingsConfig = resolve_model(
+        EmbeddingsConfig, _section("embeddings"), _ENVIRON, "EMBEDDINGS_"
     )
 
     def prettify(self):
         """Print the config in a pretty format removing passwords and other sensitive information"""
-        config_dict = self.model_dump()
-        keywords = ["pass", "token", "key"]
-        for key, value in config_dict.items():
-            if isinstance(value, str):
-                for keyword in keywords:
-                    print(key, keyword, keyword in key)
-                    if keyword in key and value is not None:
-                        config_dict[key] = "***************"
-            if isinstance(value, dict):
-                for k, v in value.items():
-                    for keyword in keywords:
-                        if keyword in k and v is not None:
-                            value[k] = "***************"
-        return json.dumps(config_dict, indent=4)
+        return json.dumps(_mask_sensitive(self.model_dump()), indent=4)
 
 
 # Global config instance
@@ -64,4 +82,3 @@ __all__ = [
 ]
 
 logging.info(CONFIG.prettify())
-print(CONFIG.prettify())
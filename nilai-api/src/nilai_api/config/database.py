@@ -7,6 +7,13 @@ class DatabaseConfig(BaseModel):
     host: str = Field(description="Database host")
     port: int = Field(description="Database port")
     db: str = Field(description="Database name")
+    pool_size: int = Field(default=10, description="Connections kept in the pool")
+    max_overflow: int = Field(
+        default=20, description="Connections opened beyond the pool size under load"
+    )
+    statement_cache_size: int = Field(
+        default=1024, description="Prepared statements cached per asyncpg connection"
+    )
 
 
 class DiscoveryConfig(BaseModel):
@@ -16,3 +23,6 @@ class DiscoveryConfig(BaseModel):
 
 class RedisConfig(BaseModel):
     url: str = Field(description="Redis URL for rate limiting")
+    user_cache_ttl: int = Field(
+        default=60, description="Seconds users are cached in Redis, 0 disables it"
+    )
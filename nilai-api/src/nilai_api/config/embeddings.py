@@ -0,0 +1,8 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+
+
+class EmbeddingsConfig(BaseModel):
+    device: Literal["cpu", "cuda"] = Field(
+        default="cpu", description="Device running the nilRAG embeddings model"
+    )
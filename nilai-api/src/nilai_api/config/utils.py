@@ -1,11 +1,25 @@
 import os
-from typing import Dict, Any, Optional, Type, TypeVar, get_origin
-import yaml
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    get_origin,
+)
 from pydantic import BaseModel
 import json
 
-load_dotenv()
+# Set NILAI_SKIP_DOTENV=1 to rely on the process environment only, e.g. in containers
+if os.environ.get("NILAI_SKIP_DOTENV") != "1":
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -13,6 +27,9 @@ T = TypeVar("T", bound=BaseModel)
 def load_config_from_yaml(config_path: str) -> Dict[str, Any]:
     """Load configuration from YAML file."""
     if os.path.exists(config_path):
+        # Imported lazily, yaml is only needed when there is a config file
+        import yaml
+
         with open(config_path, "r") as f:
             return yaml.safe_load(f)
     return {}
@@ -35,16 +52,119 @@ def create_config_model(
     config_data: Dict[str, Any],
     env_prefix: str = "",
     custom_env_mapping: Optional[Dict[str, str]] = None,
+    environ: Optional[Mapping[str, str]] = None,
 ) -> T:
     """Create Pydantic model instance with YAML-first, env override approach."""
     # Get YAML section data
     yaml_data = get_nested_value(config_data, yaml_section) or {}
+    return resolve_model(
+        model_class,
+        yaml_data,
+        os.environ if environ is None else environ,
+        env_prefix,
+        custom_env_mapping,
+    )
+
 
+def resolve_model(
+    model_class: Type[T],
+    yaml_data: Dict[str, Any],
+    environ: Mapping[str, str],
+    env_prefix: str = "",
+    custom_env_mapping: Optional[Dict[str, str]] = None,
+) -> T:
+    """
+    Create Pydantic model instance from an already extracted YAML section and environment.
+
+    Args:
+        model_class: The configuration model to create
+        yaml_data: The YAML section of the model
+        environ: The environment variables, e.g. a snapshot of os.environ shared by all models
+        env_prefix: The prefix of the environment variables of the model
+        custom_env_mapping: Environment variable names overriding the prefix logic per field
+    """
     # Prepare data dict with environment overrides
     model_data = {}
-    custom_env_mapping = custom_env_mapping or {}
+    custom_env_items = tuple(sorted((custom_env_mapping or {}).items()))
+
+    for field_name, env_keys, convert in _field_specs(
+        model_class, env_prefix, custom_env_items
+    ):
+        # Try environment variables in order
+        env_value = None
+        for env_key in env_keys:
+            env_value = environ.get(env_key)
+            if env_value is not None:
+                break
+
+        if env_value is not None:
+            # Handle type conversion for environment variables
+            model_data[field_name] = convert(env_value)
+        elif field_name in yaml_data:
+            # Use YAML value
+            model_data[field_name] = yaml_data[field_name]
+        # If neither env nor yaml has the value, let Pydantic handle defaults
+    return model_class(**model_data)
+
 
-    # Get model fields
+def _to_bool(value: str) -> bool:
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def _to_list(value: str) -> List[str]:
+    return value.split(",") if value else []
+
+
+def _to_dict(value: str) -> Dict[str, Any]:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return {}
+
+
+def _to_str(value: str) -> str:
+    return value
+
+
+_SCALAR_CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+}
+
+
+def _converter(field_type: Any) -> Callable[[str], Any]:
+    """Get the function converting an environment variable to the field type."""
+    convert = _SCALAR_CONVERTERS.get(field_type)
+    if convert is not None:
+        return convert
+    origin = get_origin(field_type)
+    if origin is list:
+        return _to_list
+    if field_type is dict or origin is dict:
+        return _to_dict
+    return _to_str
+
+
+@lru_cache(maxsize=64)
+def _field_specs(
+    model_class: Type[BaseModel],
+    env_prefix: str,
+    custom_env_items: Tuple[Tuple[str, str], ...],
+) -> Tuple[Tuple[str, Tuple[str, ...], Callable[[str], Any]], ...]:
+    """
+    Compute the environment variable names and the converter of each model field
+
+    Args:
+        model_class: The configuration model
+        env_prefix: The prefix of the environment variables of the model
+        custom_env_items: The custom environment mapping as sorted (field, variable) pairs
+
+    Returns:
+        A (field name, environment variable names, converter) tuple per field
+    """
+    custom_env_mapping = dict(custom_env_items)
+    specs = []
     for field_name, field_info in model_class.model_fields.items():
         # Determine environment variable key
         if field_name in custom_env_mapping:
@@ -59,43 +179,12 @@ def create_config_model(
             ]
 
         # Add special case for api_key -> BRAVE_SEARCH_API for backward compatibility
-        if (
-            field_name == "api_key"
-            and "BRAVE_SEARCH_API"
-            not in [custom_env_mapping.get(field_name, "")] + env_keys
-        ):
+        if field_name == "api_key" and "BRAVE_SEARCH_API" not in env_keys:
             env_keys.append("BRAVE_SEARCH_API")
 
-        # Try environment variables in order
-        env_value = None
-        for env_key in env_keys:
-            env_value = os.getenv(env_key)
-            if env_value is not None:
-                break
-
-        if env_value is not None:
-            # Handle type conversion for environment variables
-            field_type = field_info.annotation
-            if field_type is bool:
-                model_data[field_name] = env_value.lower() in ("true", "1", "yes", "on")
-            elif field_type is int:
-                model_data[field_name] = int(env_value)
-            elif field_type is float:
-                model_data[field_name] = float(env_value)
-            elif get_origin(field_type) is list:
-                model_data[field_name] = env_value.split(",") if env_value else []
-            elif field_type is dict or get_origin(field_type) is dict:
-                try:
-                    model_data[field_name] = json.loads(env_value)
-                except json.JSONDecodeError:
-                    model_data[field_name] = {}
-            else:
-                model_data[field_name] = env_value
-        elif field_name in yaml_data:
-            # Use YAML value
-            model_data[field_name] = yaml_data[field_name]
-        # If neither env nor yaml has the value, let Pydantic handle defaults
-    return model_class(**model_data)
+        convert = _converter(field_info.annotation)
+        specs.append((field_name, tuple(env_keys), convert))
+    return tuple(specs)
 
 
 def get_required_env_var(name: str) -> str:
@@ -1,8 +1,9 @@
+import hmac
 import logging
-from typing import Awaitable, Callable, Optional
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Sequence
 from fastapi import Request
 from typing import TypeAlias
-from pydantic import BaseModel
 
 from nilauth_credit_middleware import (
     CreditClientSingleton,
@@ -11,8 +12,7 @@ from nilauth_credit_middleware import (
 )
 
 from nilai_api.config import CONFIG
-
-from nuc.envelope import NucTokenEnvelope
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
 
 logger = logging.getLogger(__name__)
 
@@ -28,18 +28,23 @@ class NoOpMeteringContext:
         pass
 
 
-class LLMCost(BaseModel):
+@dataclass(frozen=True, slots=True)
+class LLMCost:
+    """Prices per token, and per web search, of a model."""
+
     prompt_tokens_price: float
     completion_tokens_price: float
     web_search_cost: float
 
-    def __init__(
-        self,
+    @classmethod
+    def from_per_million(
+        cls,
         prompt_tokens_price: float,
         completion_tokens_price: float,
         web_search_cost: float,
-    ):
-        super().__init__(
+    ) -> "LLMCost":
+        """Create the cost of a model from its prices per million tokens."""
+        return cls(
             prompt_tokens_price=prompt_tokens_price / 1_000_000,
             completion_tokens_price=completion_tokens_price / 1_000_000,
             web_search_cost=web_search_cost,
@@ -47,40 +52,53 @@ class LLMCost(BaseModel):
 
     @staticmethod
     def default() -> "LLMCost":
-        return LLMCost(
+        return LLMCost.from_per_million(
             prompt_tokens_price=2.0, completion_tokens_price=2.0, web_search_cost=0.05
         )
 
     def total_cost(
         self, prompt_tokens: int, completion_tokens: int, web_searches: int
     ) -> float:
-        logger.info(" == Cost Summary == ")
-        logger.info(
-            f"Prompt Tokens: {prompt_tokens} cost: {self.prompt_tokens_price * prompt_tokens}"
-        )
-        logger.info(
-            f"Completion Tokens: {completion_tokens} cost: {self.completion_tokens_price * completion_tokens}"
-        )
-        logger.info(
-            f"Web Searches: {web_searches} cost: {self.web_search_cost * web_searches}"
-        )
-        logger.info(
-            f"Total Cost: {self.prompt_tokens_price * prompt_tokens + self.completion_tokens_price * completion_tokens + self.web_search_cost * web_searches}"
-        )
-        return (
-            self.prompt_tokens_price * prompt_tokens
-            + self.completion_tokens_price * completion_tokens
-            + self.web_search_cost * web_searches
-        )
-
-
-class LLMUsage(BaseModel):
+        prompt_cost = self.prompt_tokens_price * prompt_tokens
+        completion_cost = self.completion_tokens_price * completion_tokens
+        web_search_cost = self.web_search_cost * web_searches
+        total = prompt_cost + completion_cost + web_search_cost
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Cost summary: prompt tokens: %s cost: %s, completion tokens: %s cost: %s, "
+                "web searches: %s cost: %s, total cost: %s",
+                prompt_tokens,
+                prompt_cost,
+                completion_tokens,
+                completion_cost,
+                web_searches,
+                web_search_cost,
+                total,
+            )
+        return total
+
+    def total_cost_batch(self, usages: Sequence["LLMUsage"]) -> list[float]:
+        """Compute the cost of several usages of this model at once."""
+        prompt_price = self.prompt_tokens_price
+        completion_price = self.completion_tokens_price
+        web_search_cost = self.web_search_cost
+        return [
+            prompt_price * usage.prompt_tokens
+            + completion_price * usage.completion_tokens
+            + web_search_cost * usage.web_searches
+            for usage in usages
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class LLMUsage:
     prompt_tokens: int
     completion_tokens: int
     web_searches: int
 
 
-class LLMResponse(BaseModel):
+@dataclass(frozen=True, slots=True)
+class LLMResponse:
     usage: LLMUsage
     data: dict
 
@@ -89,7 +107,7 @@ LLMCostDict: TypeAlias = dict[str, LLMCost]
 
 
 MyCostDictionary: LLMCostDict = {
-    "meta-llama/Llama-3.2-1B-Instruct": LLMCost(
+    "meta-llama/Llama-3.2-1B-Instruct": LLMCost.from_per_million(
         prompt_tokens_price=3.0, completion_tokens_price=3.0, web_search_cost=0.05
     ),
     "default": LLMCost.default(),
@@ -129,28 +147,43 @@ def from_nuc_bearer_root_token() -> Callable[[Request], Awaitable[str]]:
             raise ValueError("No Bearer token found")
 
         # Remove the Bearer prefix
-        token_str: str = auth_header.replace("Bearer ", "")
-        # Parse the token
-        token = NucTokenEnvelope.parse(token_str)
+        token_str: str = auth_header[7:]
+        # The issuer is memoized on the request, as the metering may need it more than once
+        cached: tuple[str, str] | None = getattr(request.state, "nuc_issuer", None)
+        if cached is not None and cached[0] == token_str:
+            return cached[1]
+        # Parse the token, sharing the envelope parsed during authentication
+        token = parse_envelope(token_str)
         # Returns the issuer of the root token from an invocation token
-        return str(token.proofs[-1].token.issuer)
+        issuer = str(token.proofs[-1].token.issuer)
+        request.state.nuc_issuer = (token_str, issuer)
+        return issuer
 
     return extractor
 
 
 def llm_cost_calculator(llm_cost_dict: LLMCostDict):
+    # The cost table is copied and its fallback built once, not on every response
+    costs: LLMCostDict = dict(llm_cost_dict)
+    default_cost = LLMCost.default()
+
     async def calculator(request: Request, response_data: dict) -> float:
-        model_name = getattr(request, "model", "default")
-        llm_cost = llm_cost_dict.get(model_name, LLMCost.default())
-        total_cost = 0.0
-        usage: Optional[LLMUsage] = response_data.get("usage", None)
+        # Set by the chat completion endpoint once the model is validated
+        model_name = getattr(request.state, "model", "default")
+        llm_cost = costs.get(model_name, default_cost)
+        usage: Optional[LLMUsage | dict] = response_data.get("usage", None)
         if usage is None:
             logger.error(f"Usage not found in response data: {response_data}")
-            return total_cost
-        total_cost += llm_cost.total_cost(
+            return 0.0
+        if isinstance(usage, dict):
+            return llm_cost.total_cost(
+                usage["prompt_tokens"],
+                usage["completion_tokens"],
+                usage["web_searches"],
+            )
+        return llm_cost.total_cost(
             usage.prompt_tokens, usage.completion_tokens, usage.web_searches
         )
-        return total_cost
 
     return calculator
 
@@ -162,28 +195,34 @@ _base_llm_meter = create_metering_dependency(
     public_identifiers=CONFIG.auth.auth_strategy == "nuc",
 )
 
+# The docs token is constant for the lifetime of the process, so whether metering
+# can be skipped is decided once at startup
+_DOCS_TOKEN: bytes | None = CONFIG.docs.token.encode() if CONFIG.docs.token else None
+
 
-async def LLMMeter(request: Request):
-    """
-    Metering dependency that skips metering for Docs Token requests.
-    """
-    # Check if the request is using the docs token
-    if CONFIG.docs.token:
+def docs_token_meter(docs_token: bytes):
+    """Metering dependency that skips metering for Docs Token requests."""
+
+    async def meter_dependency(request: Request):
         auth_header: str | None = request.headers.get("Authorization", None)
         if auth_header:
             # Extract the token from the Bearer header
             token = (
-                auth_header.replace("Bearer ", "")
-                if auth_header.startswith("Bearer ")
-                else auth_header
+                auth_header[7:] if auth_header.startswith("Bearer ") else auth_header
             )
 
-            # Skip metering if this is the docs token
-            if token == CONFIG.docs.token:
+            # Skip metering if this is the docs token, comparing in constant time
+            if hmac.compare_digest(token.encode(), docs_token):
                 logger.info("Skipping metering for Docs Token request")
                 yield NoOpMeteringContext()
                 return
 
-    # Otherwise, apply normal metering
-    async for meter in _base_llm_meter(request):
-        yield meter
+        # Otherwise, apply normal metering
+        async for meter in _base_llm_meter(request):
+            yield meter
+
+    return meter_dependency
+
+
+# Without a docs token every request is metered, so the base dependency is used as is
+LLMMeter = docs_token_meter(_DOCS_TOKEN) if _DOCS_TOKEN is not None else _base_llm_meter
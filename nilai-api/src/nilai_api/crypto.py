@@ -1,80 +1,139 @@
+import contextlib
 import os
-import fcntl
+import tempfile
+import threading
 from base64 import b64encode
+from typing import Optional
 
 from secp256k1 import PrivateKey, PublicKey
 
 PRIVATE_KEY_PATH = "private_key.key"
 
+# The key pair loaded by this process, the key file is only touched on first use
+_KEYPAIR: Optional[tuple[PrivateKey, PublicKey, str]] = None
+_KEY_LOCK = threading.Lock()
 
-def generate_key_pair() -> tuple[PrivateKey, PublicKey, str]:
+
+def _load_private_key(path: str) -> PrivateKey:
+    with open(path, "rb") as f:
+        private_key_bytes: bytes = f.read()
+    if not private_key_bytes:
+        raise ValueError("Private key file is empty or corrupted.")
+    return PrivateKey(private_key_bytes)
+
+
+def _create_key_file(path: str, private_key_bytes: bytes) -> None:
+    """Create the key file in place, failing if it already exists."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(private_key_bytes)
+    except BaseException:
+        os.unlink(path)
+        raise
+
+
+def _load_or_create_private_key(path: str) -> PrivateKey:
     """
-    Generate or load a key pair safely, preventing concurrent access using fcntl.
+    Load the private key from the key file, creating the file if it does not exist.
+
+    The new key is written to a temporary file which is then linked to the key path.
+    Linking fails if the path exists, so when several processes start at once a single
+    key file is created, and it is never visible partially written. On filesystems
+    without hard links, the key file is created exclusively and written in place.
+
+    Args:
+        path: The path of the key file
 
     Returns:
-        tuple[PrivateKey, PublicKey, str]: Private key, public key, and base64-encoded public key.
+        PrivateKey: The private key stored in the key file
     """
-    private_key: PrivateKey
+    if os.path.exists(path):
+        return _load_private_key(path)
+
+    private_key = PrivateKey()
+    private_key_bytes: bytes = private_key.private_key  # type: ignore
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(private_key_bytes)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            raise
+        except OSError:
+            _create_key_file(path, private_key_bytes)
+    except FileExistsError:
+        # Another process created the key file first, use its key
+        return _load_private_key(path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+    return private_key
 
-    # Use a separate lock file to avoid corrupting the key file itself
-    lock_path = PRIVATE_KEY_PATH + ".lock"
 
-    # Ensure the lock file exists
-    open(lock_path, "a").close()
+def generate_key_pair() -> tuple[PrivateKey, PublicKey, str]:
+    """
+    Generate or load the key pair of the process.
 
-    with open(lock_path, "r+") as lock_file:
-        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    The key pair is loaded once and cached, later calls return the same keys.
 
-        if os.path.exists(PRIVATE_KEY_PATH):
-            with open(PRIVATE_KEY_PATH, "rb") as f:
-                private_key_bytes: bytes = f.read()
-                if not private_key_bytes:
-                    raise ValueError("Private key file is empty or corrupted.")
-                private_key = PrivateKey(private_key_bytes)
-        else:
-            private_key = PrivateKey()
-            with open(PRIVATE_KEY_PATH, "wb") as f:
-                private_key_bytes: bytes = private_key.private_key  # type: ignore
-                f.write(private_key_bytes)
+    Returns:
+        tuple[PrivateKey, PublicKey, str]: Private key, public key, and base64-encoded public key.
+    """
+    global _KEYPAIR
+    if _KEYPAIR is not None:
+        return _KEYPAIR
+
+    with _KEY_LOCK:
+        if _KEYPAIR is not None:
+            return _KEYPAIR
 
-        # Release the lock
-        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        private_key = _load_or_create_private_key(PRIVATE_KEY_PATH)
+        public_key = private_key.pubkey
+        if public_key is None:
+            raise ValueError("Keypair generation failed: Public key is None")
 
-    public_key = private_key.pubkey
-    if public_key is None:
-        raise ValueError("Keypair generation failed: Public key is None")
+        b64_public_key: str = b64encode(public_key.serialize()).decode()
+        _KEYPAIR = (private_key, public_key, b64_public_key)
+        return _KEYPAIR
 
-    b64_public_key: str = b64encode(public_key.serialize()).decode()
-    return private_key, public_key, b64_public_key
 
+def _to_bytes(message: str | bytes) -> bytes:
+    return message if isinstance(message, (bytes, bytearray)) else message.encode()
 
-def sign_message(private_key: PrivateKey, message: str) -> bytes:
+
+def sign_message(private_key: PrivateKey, message: str | bytes) -> bytes:
     """
     Sign a message using the private key.
 
+    Callers signing the same payload repeatedly can pass it already encoded.
+
     Args:
         private_key (PrivateKey): The private key to sign the message with.
-        message (str): The message to sign.
+        message (str | bytes): The message to sign, strings are UTF-8 encoded.
 
     Returns:
         bytes: The signature of the message.
     """
-    signature = private_key.ecdsa_sign(message.encode())
+    signature = private_key.ecdsa_sign(_to_bytes(message))
     serialized_signature: bytes = private_key.ecdsa_serialize(signature)
     return serialized_signature
 
 
-def verify_signature(public_key: PublicKey, message: str, signature: bytes) -> bool:
+def verify_signature(
+    public_key: PublicKey, message: str | bytes, signature: bytes
+) -> bool:
     """
     Verify a signature using the public key.
 
     Args:
         public_key (PublicKey): The public key to verify the signature with.
-        message (str): The message to verify the signature with.
+        message (str | bytes): The message to verify the signature with, strings are UTF-8 encoded.
         signature (bytes): The signature to verify.
 
     Returns:
         bool: True if the signature is valid, False otherwise.
     """
     sig = public_key.ecdsa_deserialize(signature)
-    return public_key.ecdsa_verify(message.encode(), sig)
+    return public_key.ecdsa_verify(_to_bytes(message), sig)
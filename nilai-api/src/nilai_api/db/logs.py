@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import time
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 from nilai_common import Usage
 import sqlalchemy
 
-from sqlalchemy import Integer, String, DateTime, Text, Boolean, Float
+from sqlalchemy import Integer, String, DateTime, Text, Boolean, Float, Index
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 from nilai_api.db import Base, Column, get_db_session
 
@@ -16,17 +18,30 @@ logger = logging.getLogger(__name__)
 # New QueryLog Model for tracking individual queries
 class QueryLog(Base):
     __tablename__ = "query_logs"
+    __table_args__ = (
+        # Covers the usage aggregation of get_user_token_usage, so it is an index-only scan
+        Index(
+            "ix_query_logs_user_id_usage",
+            "user_id",
+            postgresql_include=["prompt_tokens", "completion_tokens"],
+        ),
+        # Monthly partitions, see ensure_query_log_partitions
+        {"postgresql_partition_by": "RANGE (query_timestamp)"},
+    )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)  # type: ignore
-    user_id: str = Column(String(75), nullable=False, index=True)  # type: ignore
+    user_id: str = Column(String(75), nullable=False)  # type: ignore
     lockid: str = Column(String(75), nullable=False, index=True)  # type: ignore
+    # Part of the primary key, as required for the partition key
     query_timestamp: datetime = Column(
-        DateTime(timezone=True), server_default=sqlalchemy.func.now(), nullable=False
+        DateTime(timezone=True),
+        server_default=sqlalchemy.func.now(),
+        nullable=False,
+        primary_key=True,
     )  # type: ignore
     model: str = Column(Text, nullable=False)  # type: ignore
     prompt_tokens: int = Column(Integer, nullable=False)  # type: ignore
     completion_tokens: int = Column(Integer, nullable=False)  # type: ignore
-    total_tokens: int = Column(Integer, nullable=False)  # type: ignore
     tool_calls: int = Column(Integer, nullable=False)  # type: ignore
     web_search_calls: int = Column(Integer, nullable=False)  # type: ignore
     temperature: Optional[float] = Column(Float, nullable=True)  # type: ignore
@@ -41,11 +56,127 @@ class QueryLog(Base):
     was_nildb: bool = Column(Boolean, nullable=False)  # type: ignore
     was_nilrag: bool = Column(Boolean, nullable=False)  # type: ignore
 
-    error_code: int = Column(Integer, nullable=False)  # type: ignore
-    error_message: str = Column(Text, nullable=False)  # type: ignore
+    # Only set when the query failed, NULL costs less than an empty value per row
+    error_code: Optional[int] = Column(Integer, nullable=True)  # type: ignore
+    error_message: Optional[str] = Column(Text, nullable=True)  # type: ignore
 
     def __repr__(self):
-        return f"<QueryLog(user_id={self.user_id}, query_timestamp={self.query_timestamp}, total_tokens={self.total_tokens})>"
+        return f"<QueryLog(user_id={self.user_id}, query_timestamp={self.query_timestamp}, total_tokens={self.prompt_tokens + self.completion_tokens})>"
+
+
+def query_log_partitions(
+    today: date, months_ahead: int
+) -> List[Tuple[str, date, date]]:
+    """
+    Get the monthly partitions of query_logs from the current month on.
+
+    Args:
+        today: The current date
+        months_ahead: The number of months to cover after the current one
+
+    Returns:
+        A (partition name, first day, first day of the next month) tuple per month
+    """
+    partitions = []
+    year, month = today.year, today.month
+    for _ in range(months_ahead + 1):
+        start = date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        partitions.append(
+            (f"query_logs_y{start.year}m{start.month:02d}", start, date(year, month, 1))
+        )
+    return partitions
+
+
+# Quotes the identifiers and literals of the partition DDL, which takes no parameters
+_DIALECT = postgresql.dialect()
+
+
+def _quote_identifier(name: str) -> str:
+    return _DIALECT.identifier_preparer.quote_identifier(name)
+
+
+def _quote_literal(value: str) -> str:
+    return str(
+        sqlalchemy.literal(value).compile(
+            dialect=_DIALECT, compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+async def _create_query_log_partition(name: str, start: date, end: date) -> None:
+    """
+    Create a monthly partition of query_logs if it does not exist yet.
+
+    Rows of the month already in the default partition would make the creation fail,
+    so the default partition is then detached while they are moved to the new one.
+    """
+    async with get_db_session() as session:
+        # Serializes the workers creating partitions at startup
+        await session.execute(
+            sqlalchemy.text("SELECT pg_advisory_xact_lock(hashtext('query_logs'))")
+        )
+        exists = await session.scalar(
+            sqlalchemy.text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        )
+        if exists:
+            return
+
+        bounds = {"start": start, "end": end}
+        create = sqlalchemy.text(
+            f"CREATE TABLE {_quote_identifier(name)} PARTITION OF query_logs "
+            f"FOR VALUES FROM ({_quote_literal(start.isoformat())}) "
+            f"TO ({_quote_literal(end.isoformat())})"
+        )
+        has_default_rows = await session.scalar(
+            sqlalchemy.text(
+                "SELECT EXISTS (SELECT 1 FROM query_logs_default "
+                "WHERE query_timestamp >= :start AND query_timestamp < :end)"
+            ),
+            bounds,
+        )
+        if not has_default_rows:
+            await session.execute(create)
+            return
+
+        await session.execute(
+            sqlalchemy.text(
+                "ALTER TABLE query_logs DETACH PARTITION query_logs_default"
+            )
+        )
+        await session.execute(create)
+        await session.execute(
+            sqlalchemy.text(
+                "WITH moved AS (DELETE FROM query_logs_default "
+                "WHERE query_timestamp >= :start AND query_timestamp < :end "
+                "RETURNING *) INSERT INTO query_logs SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        await session.execute(
+            sqlalchemy.text(
+                "ALTER TABLE query_logs ATTACH PARTITION query_logs_default DEFAULT"
+            )
+        )
+        logger.info(f"Moved the {name} query logs out of the default partition")
+
+
+async def ensure_query_log_partitions(months_ahead: int = 2) -> None:
+    """
+    Create the monthly partitions of query_logs that do not exist yet.
+
+    Called at startup. Rows logged while the process runs past the months created
+    ahead land in the default partition, and are moved to their month's partition
+    when it is created on a later startup.
+    """
+    partitions = query_log_partitions(datetime.now(timezone.utc).date(), months_ahead)
+    for name, start, end in partitions:
+        try:
+            await _create_query_log_partition(name, start, end)
+        except (SQLAlchemyError, OSError) as e:
+            # The database may not be reachable yet. The rows still land in the
+            # default partition, so the API starts.
+            logger.warning(f"Could not create query log partition {name}: {e}")
 
 
 class QueryLogContext:
@@ -68,15 +199,16 @@ class QueryLogContext:
         self.was_multimodal: bool = False
         self.was_nildb: bool = False
         self.was_nilrag: bool = False
-        self.error_code: int = 0
-        self.error_message: str = ""
+        self.error_code: Optional[int] = None
+        self.error_message: Optional[str] = None
 
         # Timing tracking
-        self.start_time: float = time.monotonic()
-        self.model_start_time: Optional[float] = None
-        self.model_end_time: Optional[float] = None
-        self.tool_start_time: Optional[float] = None
-        self.tool_end_time: Optional[float] = None
+        # Timestamps in nanoseconds from time.perf_counter_ns
+        self.start_time: int = time.perf_counter_ns()
+        self.model_start_time: Optional[int] = None
+        self.model_end_time: Optional[int] = None
+        self.tool_start_time: Optional[int] = None
+        self.tool_end_time: Optional[int] = None
 
     def set_user(self, user_id: str) -> None:
         """Set the user ID for this query."""
@@ -127,82 +259,224 @@ class QueryLogContext:
 
     def start_model_timing(self) -> None:
         """Mark the start of model inference."""
-        self.model_start_time = time.monotonic()
+        self.model_start_time = time.perf_counter_ns()
 
     def end_model_timing(self) -> None:
         """Mark the end of model inference."""
-        self.model_end_time = time.monotonic()
+        self.model_end_time = time.perf_counter_ns()
 
     def start_tool_timing(self) -> None:
         """Mark the start of tool execution."""
-        self.tool_start_time = time.monotonic()
+        self.tool_start_time = time.perf_counter_ns()
 
     def end_tool_timing(self) -> None:
         """Mark the end of tool execution."""
-        self.tool_end_time = time.monotonic()
+        self.tool_end_time = time.perf_counter_ns()
 
     def _calculate_timings(self) -> tuple[int, int, int]:
         """Calculate response times in milliseconds."""
-        total_ms = int((time.monotonic() - self.start_time) * 1000)
+        total_ms = (time.perf_counter_ns() - self.start_time) // 1_000_000
 
         model_ms = 0
-        if self.model_start_time and self.model_end_time:
-            model_ms = int((self.model_end_time - self.model_start_time) * 1000)
+        if self.model_start_time is not None and self.model_end_time is not None:
+            model_ms = (self.model_end_time - self.model_start_time) // 1_000_000
 
         tool_ms = 0
-        if self.tool_start_time and self.tool_end_time:
-            tool_ms = int((self.tool_end_time - self.tool_start_time) * 1000)
+        if self.tool_start_time is not None and self.tool_end_time is not None:
+            tool_ms = (self.tool_end_time - self.tool_start_time) // 1_000_000
 
         return total_ms, model_ms, tool_ms
 
+    def _should_log(self) -> bool:
+        """Whether the query reached a model and either used tokens or failed."""
+        return bool(
+            self.user_id
+            and self.model
+            and (self.prompt_tokens or self.completion_tokens or self.error_code)
+        )
+
     async def commit(self) -> None:
         """
         Commit the query log to the database.
         Should be called at the end of the request lifecycle.
         """
-        if not self.user_id or not self.model:
-            logger.warning(
-                "Skipping query log: user_id or model not set "
-                f"(user_id={self.user_id}, model={self.model})"
+        if not self._should_log():
+            logger.debug(
+                "Skipping query log: nothing recorded (user_id=%s, model=%s, tokens=%s, error_code=%s)",
+                self.user_id,
+                self.model,
+                self.prompt_tokens + self.completion_tokens,
+                self.error_code,
             )
             return
 
         total_ms, model_ms, tool_ms = self._calculate_timings()
         total_tokens = self.prompt_tokens + self.completion_tokens
 
+        await query_log_batcher.submit(
+            {
+                "user_id": self.user_id,
+                "lockid": self.lockid,
+                "model": self.model,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "tool_calls": self.tool_calls,
+                "web_search_calls": self.web_search_calls,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens,
+                "query_timestamp": datetime.now(timezone.utc),
+                "response_time_ms": total_ms,
+                "model_response_time_ms": model_ms,
+                "tool_response_time_ms": tool_ms,
+                "was_streamed": self.was_streamed,
+                "was_multimodal": self.was_multimodal,
+                "was_nilrag": self.was_nilrag,
+                "was_nildb": self.was_nildb,
+                "error_code": self.error_code,
+                "error_message": self.error_message or None,
+            }
+        )
+        logger.info(
+            f"Query logged for user {self.user_id}: model={self.model}, "
+            f"tokens={total_tokens}, total_ms={total_ms}"
+        )
+
+
+_QUERY_LOG_INSERT = QueryLog.__table__.insert()
+
+
+async def _insert_query_logs(rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert query log rows in a single statement.
+    Errors are logged and the rows dropped, as logging failures shouldn't break requests.
+    """
+    try:
+        async with get_db_session() as session:
+            # Core insert on the table, the rows are never read back as ORM objects
+            await session.execute(_QUERY_LOG_INSERT, rows)
+    except SQLAlchemyError as e:
+        logger.error(f"Error logging {len(rows)} queries: {e}")
+
+
+# Marks the end of the queue when the batcher is stopped
+_STOP = object()
+
+
+class QueryLogBatcher:
+    """
+    Background writer grouping query logs into bulk inserts.
+
+    Rows are flushed when max_batch_size rows are queued or max_delay seconds after
+    the first row of the batch, so requests never wait on the database. Rows
+    submitted while the queue is full are dropped and counted. When the
+    batcher is not running (e.g. outside of the application lifespan), rows are
+    inserted directly.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 64,
+        max_delay: float = 0.05,
+        max_queue_size: int = 10000,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows lost because the queue was full
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush the queued rows and stop the background writer."""
+        if self._task is None or self._queue is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def submit(self, row: Dict[str, Any]) -> None:
+        """
+        Queue a query log row without waiting, dropping it if the queue is full.
+
+        When the batcher is not running, the row is inserted directly instead.
+        """
+        if not self.running:
+            await self.insert_directly([row])
+            return
+        self.submit_nowait(row)
+
+    def submit_nowait(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue a query log row without waiting.
+
+        Returns False when the row was not queued, because the batcher is not running
+        or its queue is full.
+        """
+        if self._queue is None or not self.running:
+            return False
         try:
-            async with get_db_session() as session:
-                query_log = QueryLog(
-                    user_id=self.user_id,
-                    lockid=self.lockid,
-                    model=self.model,
-                    prompt_tokens=self.prompt_tokens,
-                    completion_tokens=self.completion_tokens,
-                    total_tokens=total_tokens,
-                    tool_calls=self.tool_calls,
-                    web_search_calls=self.web_search_calls,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                    query_timestamp=datetime.now(timezone.utc),
-                    response_time_ms=total_ms,
-                    model_response_time_ms=model_ms,
-                    tool_response_time_ms=tool_ms,
-                    was_streamed=self.was_streamed,
-                    was_multimodal=self.was_multimodal,
-                    was_nilrag=self.was_nilrag,
-                    was_nildb=self.was_nildb,
-                    error_code=self.error_code,
-                    error_message=self.error_message,
-                )
-                session.add(query_log)
-                await session.commit()
-                logger.info(
-                    f"Query logged for user {self.user_id}: model={self.model}, "
-                    f"tokens={total_tokens}, total_ms={total_ms}"
-                )
-        except SQLAlchemyError as e:
-            logger.error(f"Error logging query: {e}")
-            # Don't raise - logging failure shouldn't break the request
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            # A request never waits on a stalled database, its log is lost instead
+            self.dropped += 1
+            logger.error(
+                f"Query log queue is full, dropping the log of user {row.get('user_id')}"
+                f" ({self.dropped} dropped so far)"
+            )
+            return False
+        return True
+
+    async def insert_directly(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert query log rows right away, bypassing the queue."""
+        await _insert_query_logs(rows)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await queue.get()
+            if row is _STOP:
+                break
+            rows = [row]
+            deadline = loop.time() + self.max_delay
+            while len(rows) < self.max_batch_size:
+                try:
+                    row = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if row is _STOP:
+                    stopping = True
+                    break
+                rows.append(row)
+            try:
+                await _insert_query_logs(rows)
+            except Exception:  # Keep the writer alive whatever the failure
+                logger.exception(f"Unexpected error logging {len(rows)} queries")
+
+
+query_log_batcher = QueryLogBatcher()
 
 
 class QueryLogManager:
@@ -226,47 +500,44 @@ class QueryLogManager:
         max_tokens: int = 0,
         model_response_time_ms: int = 0,
         tool_response_time_ms: int = 0,
-        error_code: int = 0,
-        error_message: str = "",
+        error_code: Optional[int] = None,
+        error_message: Optional[str] = None,
     ):
         """
         Log a user's query (legacy method).
         Consider using QueryLogContext as a dependency instead.
+
+        The row is written by the query log batcher. Errors are logged, not raised.
         """
         total_tokens = prompt_tokens + completion_tokens
 
-        try:
-            async with get_db_session() as session:
-                query_log = QueryLog(
-                    user_id=user_id,
-                    lockid=lockid,
-                    model=model,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens,
-                    tool_calls=tool_calls,
-                    web_search_calls=web_search_calls,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    query_timestamp=datetime.now(timezone.utc),
-                    response_time_ms=response_time_ms,
-                    model_response_time_ms=model_response_time_ms,
-                    tool_response_time_ms=tool_response_time_ms,
-                    was_streamed=was_streamed,
-                    was_multimodal=was_multimodal,
-                    was_nilrag=was_nilrag,
-                    was_nildb=was_nildb,
-                    error_code=error_code,
-                    error_message=error_message,
-                )
-                session.add(query_log)
-                await session.commit()
-                logger.info(
-                    f"Query logged for user {user_id} with total tokens {total_tokens}."
-                )
-        except SQLAlchemyError as e:
-            logger.error(f"Error logging query: {e}")
-            raise
+        # Best effort as the log is advisory, a database error never fails the request
+        await query_log_batcher.submit(
+            {
+                "user_id": user_id,
+                "lockid": lockid,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "tool_calls": tool_calls,
+                "web_search_calls": web_search_calls,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "query_timestamp": datetime.now(timezone.utc),
+                "response_time_ms": response_time_ms,
+                "model_response_time_ms": model_response_time_ms,
+                "tool_response_time_ms": tool_response_time_ms,
+                "was_streamed": was_streamed,
+                "was_multimodal": was_multimodal,
+                "was_nilrag": was_nilrag,
+                "was_nildb": was_nildb,
+                "error_code": error_code,
+                "error_message": error_message or None,
+            }
+        )
+        logger.info(
+            f"Query logged for user {user_id} with total tokens {total_tokens}."
+        )
 
     @staticmethod
     async def get_user_token_usage(user_id: str) -> Optional[Usage]:
@@ -285,9 +556,6 @@ class QueryLogManager:
                         sqlalchemy.func.coalesce(
                             sqlalchemy.func.sum(QueryLog.completion_tokens), 0
                         ).label("completion_tokens"),
-                        sqlalchemy.func.coalesce(
-                            sqlalchemy.func.sum(QueryLog.total_tokens), 0
-                        ).label("total_tokens"),
                         sqlalchemy.func.count().label("queries"),
                     ).where(QueryLog.user_id == user_id)  # type: ignore[arg-type]
                 )
@@ -301,11 +569,19 @@ class QueryLogManager:
                 return Usage(
                     prompt_tokens=int(row.prompt_tokens),
                     completion_tokens=int(row.completion_tokens),
-                    total_tokens=int(row.total_tokens),
+                    # The total is not stored, it is always the sum of both counters
+                    total_tokens=int(row.prompt_tokens) + int(row.completion_tokens),
                 )
         except SQLAlchemyError as e:
             logger.error(f"Error getting token usage: {e}")
             return None
 
 
-__all__ = ["QueryLogManager", "QueryLog", "QueryLogContext"]
+__all__ = [
+    "QueryLogManager",
+    "QueryLog",
+    "QueryLogContext",
+    "QueryLogBatcher",
+    "query_log_batcher",
+    "ensure_query_log_partitions",
+]
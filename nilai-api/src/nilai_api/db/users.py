@@ -1,11 +1,16 @@
+import functools
+import json
 import logging
 import uuid
 from pydantic import BaseModel, ConfigDict, Field
 
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 import sqlalchemy
-from sqlalchemy import String, JSON
+from redis.asyncio import Redis, from_url
+from redis.exceptions import RedisError
+from sqlalchemy import String, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import SQLAlchemyError
 
 from nilai_api.db import Base, Column, get_db_session
@@ -17,6 +22,9 @@ logger = logging.getLogger(__name__)
 class RateLimits(BaseModel):
     """Rate limit configuration for a user."""
 
+    # Effective limits are shared between users, so they cannot be modified
+    model_config = ConfigDict(frozen=True)
+
     # General rate limits
     user_rate_limit_day: Optional[int] = None
     user_rate_limit_hour: Optional[int] = None
@@ -33,31 +41,68 @@ class RateLimits(BaseModel):
 
     def get_effective_limits(self) -> "RateLimits":
         """Return rate limits with defaults applied from config."""
-        return RateLimits(
-            user_rate_limit_day=self.user_rate_limit_day
-            or CONFIG.rate_limiting.user_rate_limit_day,
-            user_rate_limit_hour=self.user_rate_limit_hour
-            or CONFIG.rate_limiting.user_rate_limit_hour,
-            user_rate_limit_minute=self.user_rate_limit_minute
-            or CONFIG.rate_limiting.user_rate_limit_minute,
-            web_search_rate_limit_day=self.web_search_rate_limit_day
-            or CONFIG.rate_limiting.web_search_rate_limit_day,
-            web_search_rate_limit_hour=self.web_search_rate_limit_hour
-            or CONFIG.rate_limiting.web_search_rate_limit_hour,
-            web_search_rate_limit_minute=self.web_search_rate_limit_minute
-            or CONFIG.rate_limiting.web_search_rate_limit_minute,
-            user_rate_limit=self.user_rate_limit
-            or CONFIG.rate_limiting.user_rate_limit,
-            web_search_rate_limit=self.web_search_rate_limit
-            or CONFIG.rate_limiting.user_rate_limit,
+        return _effective_limits(
+            (
+                self.user_rate_limit_day,
+                self.user_rate_limit_hour,
+                self.user_rate_limit_minute,
+                self.web_search_rate_limit_day,
+                self.web_search_rate_limit_hour,
+                self.web_search_rate_limit_minute,
+                self.user_rate_limit,
+                self.web_search_rate_limit,
+            )
         )
 
 
+# The configured defaults, in the order of the RateLimits fields, read once at import
+_DEFAULT_LIMITS: Tuple[Optional[int], ...] = (
+    CONFIG.rate_limiting.user_rate_limit_day,
+    CONFIG.rate_limiting.user_rate_limit_hour,
+    CONFIG.rate_limiting.user_rate_limit_minute,
+    CONFIG.rate_limiting.web_search_rate_limit_day,
+    CONFIG.rate_limiting.web_search_rate_limit_hour,
+    CONFIG.rate_limiting.web_search_rate_limit_minute,
+    CONFIG.rate_limiting.user_rate_limit,
+    CONFIG.rate_limiting.user_rate_limit,
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _effective_limits(limits: Tuple[Optional[int], ...]) -> RateLimits:
+    """
+    Apply the configured defaults to a tuple of rate limits.
+
+    Users share a handful of distinct rate limits, so the results are memoized.
+    """
+    values: Dict[str, Any] = {
+        field: value or default
+        for field, value, default in zip(
+            RateLimits.model_fields, limits, _DEFAULT_LIMITS
+        )
+    }
+    return RateLimits.model_construct(**values)
+
+
+# The effective limits of users without rate limits, shared by all of them
+_DEFAULT_RATE_LIMITS: RateLimits = RateLimits().get_effective_limits()
+
+
 # Enhanced User Model with additional constraints and validation
 class UserModel(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Answers the containment (@>) queries of find_users_by_rate_limits
+        Index(
+            "ix_users_rate_limits",
+            "rate_limits",
+            postgresql_using="gin",
+            postgresql_ops={"rate_limits": "jsonb_path_ops"},
+        ),
+    )
+
     user_id: str = Column(String(75), primary_key=True, index=True)  # type: ignore
-    rate_limits: dict = Column(JSON, nullable=True)  # type: ignore
+    rate_limits: dict = Column(JSONB, nullable=True)  # type: ignore
 
     def __repr__(self):
         return f"<User(user_id={self.user_id})>"
@@ -66,7 +111,7 @@ class UserModel(Base):
     def rate_limits_obj(self) -> RateLimits:
         """Get rate limits as a RateLimits object with defaults applied."""
         if self.rate_limits is None:
-            return RateLimits().get_effective_limits()
+            return _DEFAULT_RATE_LIMITS
         return RateLimits(**self.rate_limits).get_effective_limits()
 
     def to_pydantic(self) -> "UserData":
@@ -75,7 +120,7 @@ class UserModel(Base):
 
 class UserData(BaseModel):
     user_id: str  # apikey or subscription holder public key
-    rate_limits: RateLimits = Field(default_factory=RateLimits().get_effective_limits)
+    rate_limits: RateLimits = Field(default_factory=lambda: _DEFAULT_RATE_LIMITS)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -87,6 +132,32 @@ class UserData(BaseModel):
         )
 
 
+_redis: Optional[Redis] = None
+
+
+def get_user_cache() -> Redis:
+    """Get the Redis client caching the users, creating it on first use."""
+    global _redis
+    if _redis is None:
+        _redis = from_url(CONFIG.redis.url, encoding="utf8")
+    return _redis
+
+
+def _user_cache_key(user_id: str) -> str:
+    # Not user:{user_id}, which holds the for-good rate limit counter in the same Redis
+    return f"user_cache:{user_id}"
+
+
+async def _invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the cache, so the next lookup reads the database."""
+    if CONFIG.redis.user_cache_ttl <= 0:
+        return
+    try:
+        await get_user_cache().delete(_user_cache_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Error invalidating cached user {user_id}: {e}")
+
+
 class UserManager:
     @staticmethod
     def generate_user_id() -> str:
@@ -136,10 +207,11 @@ class UserManager:
                 session.add(user)
                 await session.commit()
                 logger.info(f"User {user.user_id} added successfully.")
-                return user
         except SQLAlchemyError as e:
             logger.error(f"Error inserting user: {e}")
             raise
+        await _invalidate_cached_user(user.user_id)
+        return user
 
     @staticmethod
     async def check_user(user_id: str) -> Optional[UserModel]:
@@ -152,18 +224,37 @@ class UserManager:
         Returns:
             User's rate limits if user id is valid, None otherwise
         """
+        # Users are cached in Redis for a short time, the cache is best effort
+        # and the database is queried whenever Redis is unavailable
+        cache_ttl = CONFIG.redis.user_cache_ttl
+        key = _user_cache_key(user_id)
+        if cache_ttl > 0:
+            try:
+                cached = await get_user_cache().get(key)
+            except RedisError as e:
+                logger.warning(f"Error reading cached user {user_id}: {e}")
+                cached = None
+            if cached is not None:
+                return UserModel(user_id=user_id, rate_limits=json.loads(cached))
+
         try:
             async with get_db_session() as session:
-                query = sqlalchemy.select(UserModel).filter(
-                    UserModel.user_id == user_id  # type: ignore
-                )
-                user = await session.execute(query)
-                user = user.scalar_one_or_none()
-                return user
+                # Primary key lookup, without compiling a SELECT statement
+                user = await session.get(UserModel, user_id)
         except SQLAlchemyError as e:
             logger.error(f"Rate limit checking user id: {e}")
             return None
 
+        # Unknown users are not cached, they may be inserted at any time
+        if user is not None and cache_ttl > 0:
+            try:
+                await get_user_cache().set(
+                    key, json.dumps(user.rate_limits), ex=cache_ttl
+                )
+            except RedisError as e:
+                logger.warning(f"Error caching user {user_id}: {e}")
+        return user
+
     @staticmethod
     async def update_rate_limits(user_id: str, rate_limits: RateLimits) -> bool:
         """
@@ -183,13 +274,37 @@ class UserManager:
                     user.rate_limits = rate_limits.model_dump()
                     await session.commit()
                     logger.info(f"Updated rate limits for user {user_id}")
-                    return True
                 else:
                     logger.warning(f"User {user_id} not found")
                     return False
         except SQLAlchemyError as e:
             logger.error(f"Error updating rate limits: {e}")
             return False
+        await _invalidate_cached_user(user_id)
+        return True
+
+    @staticmethod
+    async def find_users_by_rate_limits(rate_limits: dict) -> list[UserModel]:
+        """
+        Find the users whose rate limits contain the given values.
+
+        Args:
+            rate_limits (dict): Rate limit fields and their values,
+                e.g. {"user_rate_limit_day": 100}
+
+        Returns:
+            list[UserModel]: The matching users
+        """
+        try:
+            async with get_db_session() as session:
+                query = sqlalchemy.select(UserModel).filter(
+                    UserModel.rate_limits.contains(rate_limits)  # type: ignore
+                )
+                users = await session.execute(query)
+                return list(users.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error finding users by rate limits: {e}")
+            return []
 
 
 __all__ = ["UserManager", "UserData", "UserModel"]
@@ -1,43 +1,122 @@
+import asyncio
+import importlib.util
 import logging
+import math
 from typing import Union
 
 import nilrag
+import numpy as np
 
 from nilai_common import ChatRequest, MessageAdapter
 from fastapi import HTTPException, status
+from nilai_api.cache import TTLCache, token_hash
+from nilai_api.config import CONFIG
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 embeddings_model = None
 
 
+EMBEDDINGS_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Dynamically quantized INT8 export of the model, published in its repository
+EMBEDDINGS_ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def _onnx_runtime_available() -> bool:
+    """Whether the ONNX Runtime backend of sentence-transformers is installed."""
+    return (
+        importlib.util.find_spec("onnxruntime") is not None
+        and importlib.util.find_spec("optimum") is not None
+    )
+
+
 def get_embeddings_model():
     """
-    Lazy load the embeddings model on CPU.
+    Lazy load the embeddings model.
+
+    With `embeddings.device` set to cuda, the model runs in FP16 on the GPU.
+    On CPU, the INT8 quantized model runs on ONNX Runtime when it is installed
+    (`sentence-transformers[onnx]`), the FP32 PyTorch model is used otherwise.
     """
     global embeddings_model
     if embeddings_model is None:
-        embeddings_model = SentenceTransformer(
-            "sentence-transformers/all-MiniLM-L6-v2", device="cpu"
-        )  # FIXME: Use a GPU model and move to a separate container
+        if CONFIG.embeddings.device == "cuda":
+            embeddings_model = SentenceTransformer(
+                EMBEDDINGS_MODEL_NAME, device="cuda"
+            ).half()
+        elif _onnx_runtime_available():
+            embeddings_model = SentenceTransformer(
+                EMBEDDINGS_MODEL_NAME,
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"file_name": EMBEDDINGS_ONNX_INT8_FILE},
+            )
+        else:
+            embeddings_model = SentenceTransformer(EMBEDDINGS_MODEL_NAME, device="cpu")
+        # The model is only used for inference
+        embeddings_model.eval()
     return embeddings_model
 
 
+async def warmup_embeddings_model() -> None:
+    """
+    Load the embeddings model and run it once, ahead of the first request.
+
+    Called when the application starts, the loading runs in a thread to keep the
+    event loop free.
+    """
+
+    def warmup():
+        get_embeddings_model().encode("warmup", convert_to_tensor=False)
+
+    await asyncio.to_thread(warmup)
+    logger.info("Embeddings model loaded")
+
+
+# Embeddings keyed by the digest of their text, as float32 vectors
+EMBEDDINGS_CACHE_MAXSIZE = 4096
+_embeddings_cache: TTLCache[bytes, np.ndarray] = TTLCache(
+    maxsize=EMBEDDINGS_CACHE_MAXSIZE, ttl=math.inf
+)
+
+
 def generate_embeddings_huggingface(
     chunks_or_query: Union[str, list],
 ):
     """
     Generate embeddings for text using a HuggingFace sentence transformer model.
 
+    The embeddings are cached by text, and the texts missing from the cache are
+    encoded in a single batch.
+
     Args:
         chunks_or_query (str or list): Text string(s) to generate embeddings for
 
     Returns:
         numpy.ndarray: Array of embeddings for the input text
     """
-    embeddings_model = get_embeddings_model()
-    embeddings = embeddings_model.encode(chunks_or_query, convert_to_tensor=False)
-    return embeddings
+    texts = [chunks_or_query] if isinstance(chunks_or_query, str) else chunks_or_query
+    keys = [token_hash(text) for text in texts]
+    embeddings = [_embeddings_cache.get(key) for key in keys]
+
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        encoded = get_embeddings_model().encode(
+            [texts[i] for i in missing], convert_to_tensor=False
+        )
+        for i, embedding in zip(missing, encoded):
+            embedding = np.asarray(embedding, dtype=np.float32)
+            _embeddings_cache.set(keys[i], embedding)
+            embeddings[i] = embedding
+
+    result: list[np.ndarray] = [e for e in embeddings if e is not None]
+    assert len(result) == len(embeddings)
+    if isinstance(chunks_or_query, str):
+        return result[0]
+    if not result:
+        # Same result as before the cache for an empty batch
+        return get_embeddings_model().encode([], convert_to_tensor=False)
+    return np.stack(result)
 
 
 async def handle_nilrag(req: ChatRequest):
@@ -82,6 +161,8 @@ async def handle_nilrag(req: ChatRequest):
         num_chunks = req.nilrag.get("num_chunks", 2)
 
         # Step 2: Execute nilRAG
+        # The nodes hold secret shares of the distances, so the chunks can only be
+        # ranked once nilrag has combined the answers of all the nodes
         top_results = await nilDB.top_num_chunks_execute(query, num_chunks)
 
         # Step 3: Format top results
@@ -2,22 +2,159 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
+from typing import List, Optional, Tuple
 
-from e2b_code_interpreter import Sandbox
+from e2b_code_interpreter import AsyncSandbox
 
 logger = logging.getLogger(__name__)
 
+# Lifetime requested for each sandbox, e2b shuts it down afterwards
+SANDBOX_TIMEOUT_SECONDS = 300
+# Idle sandboxes older than this are discarded, so none expires while in use
+SANDBOX_MAX_IDLE_SECONDS = 240
 
-def _run_in_sandbox_sync(code: str) -> str:
+
+async def _create_sandbox() -> AsyncSandbox:
+    return await AsyncSandbox.create(timeout=SANDBOX_TIMEOUT_SECONDS)
+
+
+async def _kill_sandbox(sandbox: AsyncSandbox) -> None:
+    try:
+        await sandbox.kill()
+    except Exception as e:
+        logger.warning("Error killing sandbox: %s", e)
+
+
+class SandboxPool:
+    """
+    Sandboxes booted ahead of the code executions that need them.
+
+    Booting a sandbox takes seconds, so up to `size` sandboxes are kept ready by a
+    background task, which replaces the ones idle for longer than `max_idle`. Each
+    sandbox runs the code of a single execution and is then
+    killed, so no state is shared between executions. When the pool is not running
+    (e.g. outside of the application lifespan) or is empty, a sandbox is booted on
+    demand.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_idle: float = SANDBOX_MAX_IDLE_SECONDS,
+        retry_delay: float = 30.0,
+        check_interval: float = 30.0,
+    ):
+        self.size = size
+        self.max_idle = max_idle
+        self.retry_delay = retry_delay
+        self.check_interval = check_interval
+        self._idle: Optional[asyncio.Queue[Tuple[float, AsyncSandbox]]] = None
+        # Set when a sandbox leaves the pool, to wake up the refill task
+        self._taken: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def configured(self) -> bool:
+        """Whether e2b credentials are set, without them no sandbox can be booted."""
+        return self.size > 0 and bool(os.environ.get("E2B_API_KEY"))
+
+    def start(self) -> None:
+        """Start booting sandboxes in the background on the running event loop."""
+        if self.running or self.size <= 0:
+            return
+        self._idle = asyncio.Queue(maxsize=self.size)
+        self._taken = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop booting sandboxes and kill the idle ones."""
+        if self._task is None or self._idle is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        idle = self._idle
+        self._task = None
+        self._idle = None
+        self._taken = None
+        while not idle.empty():
+            _, sandbox = idle.get_nowait()
+            await _kill_sandbox(sandbox)
+
+    async def acquire(self) -> AsyncSandbox:
+        """Get a ready sandbox, booting one if none is available."""
+        idle, taken = self._idle, self._taken
+        if idle is not None and taken is not None:
+            while not idle.empty():
+                created_at, sandbox = idle.get_nowait()
+                taken.set()
+                if time.monotonic() - created_at < self.max_idle:
+                    return sandbox
+                await _kill_sandbox(sandbox)
+        return await _create_sandbox()
+
+    async def release(self, sandbox: AsyncSandbox) -> None:
+        """Kill a sandbox once its execution is over."""
+        await _kill_sandbox(sandbox)
+
+    def _take_stale(self) -> List[AsyncSandbox]:
+        """Remove the sandboxes idle for longer than max_idle from the pool."""
+        assert self._idle is not None
+        now = time.monotonic()
+        fresh, stale = [], []
+        while not self._idle.empty():
+            created_at, sandbox = self._idle.get_nowait()
+            if now - created_at < self.max_idle:
+                fresh.append((created_at, sandbox))
+            else:
+                stale.append(sandbox)
+        for entry in fresh:
+            self._idle.put_nowait(entry)
+        return stale
+
+    async def _run(self) -> None:
+        assert self._idle is not None and self._taken is not None
+        idle, taken = self._idle, self._taken
+        while True:
+            for sandbox in self._take_stale():
+                await _kill_sandbox(sandbox)
+            if idle.full():
+                # Wake up when a sandbox is taken, or in time to replace stale ones
+                taken.clear()
+                try:
+                    await asyncio.wait_for(taken.wait(), self.check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                sandbox = await _create_sandbox()
+            except Exception as e:  # Keep the pool alive whatever the failure
+                logger.error("Error booting a sandbox for the pool: %s", e)
+                await asyncio.sleep(self.retry_delay)
+                continue
+            idle.put_nowait((time.monotonic(), sandbox))
+
+
+sandbox_pool = SandboxPool()
+
+
+async def _run_in_sandbox(sandbox: AsyncSandbox, code: str) -> str:
     """Execute Python code in an e2b sandbox and return the textual output or stdout if available."""
     try:
-        with Sandbox.create() as sandbox:
-            exec_ = sandbox.run_code(code)
-            if exec_.text:
-                return exec_.text
-            if getattr(exec_, "logs", None) and getattr(exec_.logs, "stdout", None):
-                return "\n".join(exec_.logs.stdout)
-            return ""
+        exec_ = await sandbox.run_code(code)
+        if exec_.text:
+            return exec_.text
+        if getattr(exec_, "logs", None) and getattr(exec_.logs, "stdout", None):
+            return "\n".join(exec_.logs.stdout)
+        return ""
     except Exception as e:
         logger.error("Error executing code in sandbox: %s", e)
         raise
@@ -26,11 +163,15 @@ def _run_in_sandbox_sync(code: str) -> str:
 async def execute_python(code: str) -> str:
     """Execute Python code in an e2b Code Interpreter sandbox and return the textual output.
 
-    This function is async-safe and runs the blocking execution in a thread.
+    The sandbox is driven by the async e2b client, so executions share the event loop.
     """
     logger.info("Executing Python code asynchronously")
     try:
-        result = await asyncio.to_thread(_run_in_sandbox_sync, code)
+        sandbox = await sandbox_pool.acquire()
+        try:
+            result = await _run_in_sandbox(sandbox, code)
+        finally:
+            await sandbox_pool.release(sandbox)
         logger.info("Python code execution completed successfully")
         return result
     except Exception as e:
@@ -94,7 +94,8 @@ def extract_tool_calls_from_response_message(
     except Exception:
         content = response_message.content
 
-    if not content:
+    # Only a JSON object can describe a tool call, skip parsing plain text answers
+    if not content or not content.lstrip().startswith("{"):
         return []
 
     try:
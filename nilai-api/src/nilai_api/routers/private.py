@@ -148,6 +148,8 @@ async def chat_completion_concurrent_rate_limit(request: Request) -> Tuple[int,
         chat_request = ChatRequest(**body)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid request body")
+    # Record the model for the metering cost calculator, which prices requests per model
+    request.state.model = chat_request.model
     key = f"chat:{chat_request.model}"
     limit = CONFIG.rate_limiting.model_concurrent_rate_limit.get(
         chat_request.model,
@@ -37,6 +37,7 @@ def database_config(postgres_container):
         "password": CONFIG.database.password,
         "db": CONFIG.database.db,
     }
+    original_user_cache_ttl = CONFIG.redis.user_cache_ttl
 
     # Update CONFIG to use test database
     CONFIG.database.host = postgres_container.get_container_host_ip()
@@ -44,6 +45,8 @@ def database_config(postgres_container):
     CONFIG.database.user = "testuser"
     CONFIG.database.password = "testpass"
     CONFIG.database.db = "testdb"
+    # The tests update the users table directly, so users are not cached
+    CONFIG.redis.user_cache_ttl = 0
 
     # Clear any existing engine/session maker to force re-creation with new config
     import nilai_api.db
@@ -59,6 +62,7 @@ def database_config(postgres_container):
     CONFIG.database.user = original_config["user"]
     CONFIG.database.password = original_config["password"]
     CONFIG.database.db = original_config["db"]
+    CONFIG.redis.user_cache_ttl = original_user_cache_ttl
 
     # Clear test engine/session maker
     nilai_api.db._engine = None
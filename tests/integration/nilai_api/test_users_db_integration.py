@@ -436,3 +436,24 @@ class TestUserManagerIntegration:
             fake_user_id, new_rate_limits
         )
         assert error_update is False
+
+    @pytest.mark.asyncio
+    async def test_find_users_by_rate_limits(self, clean_database):
+        """Test finding users by a subset of their rate limits."""
+        limited = await UserManager.insert_user(
+            user_id="Limited User", rate_limits=RateLimits(user_rate_limit_day=100)
+        )
+        await UserManager.insert_user(
+            user_id="Other User", rate_limits=RateLimits(user_rate_limit_day=200)
+        )
+        await UserManager.insert_user(user_id="Default User")
+
+        found = await UserManager.find_users_by_rate_limits(
+            {"user_rate_limit_day": 100}
+        )
+        assert [user.user_id for user in found] == [limited.user_id]
+
+        none_found = await UserManager.find_users_by_rate_limits(
+            {"user_rate_limit_day": 300}
+        )
+        assert none_found == []
@@ -12,6 +12,15 @@ from nilai_api.config import CONFIG as config
 config.auth.auth_strategy = "api_key"
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    from nilai_api.auth import _auth_cache
+
+    _auth_cache.clear()
+    yield
+    _auth_cache.clear()
+
+
 @pytest.fixture
 def mock_validate_credential(mocker):
     """Fixture to mock validate_credential function."""
@@ -79,3 +88,140 @@ async def test_get_auth_info_invalid_token(mock_validate_credential):
     assert "Credential not found" in str(exc_info.value.detail), (
         f"Expected 'Credential not found' but got {exc_info.value.detail}"
     )
+
+
+@pytest.mark.asyncio
+async def test_get_auth_info_caches_successful_authentication(
+    mock_validate_credential, mock_user_model
+):
+    """Test that a token is only validated once while it is cached."""
+    from nilai_api.auth import get_auth_info
+
+    mock_validate_credential.return_value = mock_user_model
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials="cached-token"
+    )
+
+    first = await get_auth_info(credentials)
+    second = await get_auth_info(credentials)
+
+    assert first is second
+    assert mock_validate_credential.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_auth_info_does_not_cache_failures(
+    mock_validate_credential, mock_user_model
+):
+    """Test that a failed authentication is retried on the next request."""
+    from nilai_api.auth import get_auth_info
+    from nilai_api.auth.common import AuthenticationError
+
+    mock_validate_credential.side_effect = [
+        AuthenticationError("Credential not found"),
+        mock_user_model,
+    ]
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials="retried-token"
+    )
+
+    with pytest.raises(AuthenticationError):
+        await get_auth_info(credentials)
+    auth_info = await get_auth_info(credentials)
+
+    assert auth_info.user.user_id == "test-user-id"
+    assert mock_validate_credential.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_auth_info_single_flight(mock_validate_credential, mock_user_model):
+    """Test that concurrent requests with the same token share one validation."""
+    import asyncio
+
+    from nilai_api.auth import get_auth_info
+
+    async def slow_validate_credential(credential, is_public):
+        await asyncio.sleep(0.01)
+        return mock_user_model
+
+    mock_validate_credential.side_effect = slow_validate_credential
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials="concurrent-token"
+    )
+
+    results = await asyncio.gather(*(get_auth_info(credentials) for _ in range(5)))
+
+    assert all(result is results[0] for result in results)
+    assert mock_validate_credential.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_auth_info_survives_cancelled_first_request(
+    mock_validate_credential, mock_user_model
+):
+    """Test that cancelling the request which started a validation spares the others."""
+    import asyncio
+
+    from nilai_api.auth import _in_flight, get_auth_info
+
+    async def slow_validate_credential(credential, is_public):
+        await asyncio.sleep(0.01)
+        return mock_user_model
+
+    mock_validate_credential.side_effect = slow_validate_credential
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials="cancelled-token"
+    )
+
+    first = asyncio.create_task(get_auth_info(credentials))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(get_auth_info(credentials))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    auth_info = await second
+    assert auth_info.user.user_id == "test-user-id"
+    assert first.cancelled()
+    assert mock_validate_credential.call_count == 1
+    assert not _in_flight
+
+
+def test_authentication_info_has_a_single_definition():
+    """Test that the re-exported AuthenticationInfo is the class from auth.common."""
+    from nilai_api import auth
+    from nilai_api.auth import common
+    from nilai_api.auth.strategies import AuthenticationInfo as StrategiesInfo
+
+    assert auth.AuthenticationInfo is common.AuthenticationInfo
+    assert StrategiesInfo is common.AuthenticationInfo
+
+
+def test_auth_cache_ttl_is_capped_by_token_expiration(mock_user_data):
+    """Test a token expiring before the cache TTL is not cached beyond its expiration."""
+    from datetime import timedelta
+
+    from nilai_api.auth import _auth_cache, _cache_auth_info
+    from nilai_api.auth.common import AuthenticationInfo
+    from nilai_api.auth.strategies import _envelope_expires_at
+
+    now = datetime.now(timezone.utc)
+    envelope = MagicMock()
+    envelope.token.token.expires_at = now + timedelta(minutes=5)
+    proof = MagicMock()
+    proof.token.expires_at = now - timedelta(seconds=1)
+    envelope.proofs = [proof]
+    expires_at = _envelope_expires_at(envelope)
+    assert expires_at == proof.token.expires_at
+
+    auth_info = AuthenticationInfo.model_construct(
+        user=mock_user_data,
+        token_rate_limit=None,
+        prompt_document=None,
+        expires_at=expires_at,
+    )
+    _cache_auth_info(b"expired-proof", auth_info)
+    assert _auth_cache.get(b"expired-proof") is None
+
+    auth_info.expires_at = now + timedelta(hours=1)
+    _cache_auth_info(b"valid", auth_info)
+    assert _auth_cache.get(b"valid") is auth_info
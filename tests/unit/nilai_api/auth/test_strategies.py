@@ -10,6 +10,12 @@ from nilai_api.db.users import RateLimits, UserModel
 class TestAuthStrategies:
     """Test class for authentication strategies with nilDB integration"""
 
+    @pytest.fixture(autouse=True)
+    def mock_nuc_envelope_parse(self):
+        """Mock the NUC token parsing done once by the NUC strategy"""
+        with patch("nilai_api.auth.strategies.parse_envelope") as mock_parse:
+            yield mock_parse
+
     @pytest.fixture
     def mock_user_model(self):
         """Mock UserModel fixture"""
@@ -52,7 +58,7 @@ class TestAuthStrategies:
 
     @pytest.mark.asyncio
     async def test_nuc_strategy_existing_user_with_prompt_document(
-        self, mock_user_model, mock_prompt_document
+        self, mock_user_model, mock_prompt_document, mock_nuc_envelope_parse
     ):
         """Test NUC authentication with existing user and prompt document"""
         with (
@@ -80,6 +86,11 @@ class TestAuthStrategies:
             mock_validate_credential.assert_called_once_with(
                 "subscription_holder", is_public=True
             )
+            envelope = mock_nuc_envelope_parse.return_value
+            mock_nuc_envelope_parse.assert_called_once_with("nuc-token")
+            mock_validate_nuc.assert_called_once_with(envelope)
+            mock_get_rate_limit.assert_called_once_with(envelope)
+            mock_get_prompt_doc.assert_called_once_with(envelope)
 
     @pytest.mark.asyncio
     async def test_nuc_strategy_new_user_with_token_limits(
@@ -226,3 +237,125 @@ class TestAuthStrategies:
             result = await nuc_strategy("nuc-token")
             assert hasattr(result, "prompt_document")
             assert result.prompt_document is None
+
+
+class TestValidateCredentialCache:
+    """Test class for the credential validation cache"""
+
+    @pytest.fixture(autouse=True)
+    def clear_credential_cache(self):
+        from nilai_api.auth.strategies import _credential_cache
+
+        _credential_cache.clear()
+        yield
+        _credential_cache.clear()
+
+    @pytest.fixture
+    def mock_credit_client(self):
+        from unittest.mock import AsyncMock
+
+        client = MagicMock()
+        client.validate_credential = AsyncMock()
+        with patch(
+            "nilai_api.auth.strategies.CreditClientSingleton.get_client",
+            return_value=client,
+        ):
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_valid_credential_is_cached(self, mock_credit_client):
+        """Test that a valid credential is only checked once with the credit service"""
+        from unittest.mock import AsyncMock
+
+        from nilai_api.auth.strategies import validate_credential
+
+        mock_credit_client.validate_credential.return_value = MagicMock(
+            user_id="cached-user"
+        )
+        user_model = MagicMock(spec=UserModel)
+        with patch(
+            "nilai_api.auth.strategies.UserManager.check_user",
+            new=AsyncMock(return_value=user_model),
+        ):
+            first = await validate_credential("credential", is_public=False)
+            second = await validate_credential("credential", is_public=False)
+
+        assert first is user_model
+        assert second is user_model
+        mock_credit_client.validate_credential.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_not_found_credential_is_cached(self, mock_credit_client):
+        """Test that a credential that is not found is rejected without a new check"""
+        from fastapi import HTTPException
+
+        from nilai_api.auth.common import AuthenticationError
+        from nilai_api.auth.strategies import validate_credential
+
+        mock_credit_client.validate_credential.side_effect = HTTPException(
+            status_code=404, detail="missing"
+        )
+
+        for _ in range(2):
+            with pytest.raises(AuthenticationError, match="Credential not found"):
+                await validate_credential("unknown", is_public=True)
+
+        mock_credit_client.validate_credential.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_service_errors_are_not_cached(self, mock_credit_client):
+        """Test that unexpected credit service errors are retried"""
+        from fastapi import HTTPException
+
+        from nilai_api.auth.common import AuthenticationError
+        from nilai_api.auth.strategies import validate_credential
+
+        mock_credit_client.validate_credential.side_effect = HTTPException(
+            status_code=500, detail="unavailable"
+        )
+
+        for _ in range(2):
+            with pytest.raises(AuthenticationError, match="Failed to validate"):
+                await validate_credential("credential", is_public=True)
+
+        assert mock_credit_client.validate_credential.await_count == 2
+
+
+class TestAllowToken:
+    """Test class for the allow_token bypass decorator"""
+
+    @pytest.mark.asyncio
+    async def test_allowed_token_bypasses_strategy(self):
+        from unittest.mock import AsyncMock
+
+        from nilai_api.auth.strategies import allow_token
+
+        strategy = AsyncMock()
+        wrapped = allow_token("docs-token")(strategy)
+
+        result = await wrapped("docs-token")
+
+        assert result.user.user_id == "docs-token"
+        strategy.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_other_tokens_use_strategy(self):
+        from unittest.mock import AsyncMock
+
+        from nilai_api.auth.strategies import allow_token
+
+        strategy = AsyncMock(return_value="authenticated")
+        wrapped = allow_token("docs-token")(strategy)
+
+        assert await wrapped("other-tökën") == "authenticated"
+        strategy.assert_awaited_once_with("other-tökën")
+
+    @pytest.mark.asyncio
+    async def test_allowed_token_info_is_built_once(self):
+        from unittest.mock import AsyncMock
+
+        from nilai_api.auth.strategies import allow_token
+
+        wrapped = allow_token("docs-token")(AsyncMock())
+
+        assert await wrapped("docs-token") is await wrapped("docs-token")
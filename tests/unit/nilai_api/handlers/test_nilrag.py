@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from nilai_api.config import CONFIG
+from nilai_api.handlers import nilrag
+
+
+@pytest.fixture
+def mock_model(mocker):
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, convert_to_tensor: np.array(
+        [[float(len(text)), 1.0] for text in texts]
+    )
+    mocker.patch("nilai_api.handlers.nilrag.get_embeddings_model", return_value=model)
+    nilrag._embeddings_cache.clear()
+    yield model
+    nilrag._embeddings_cache.clear()
+
+
+def test_embeddings_are_cached_and_misses_batched(mock_model):
+    first = nilrag.generate_embeddings_huggingface(["a", "bb"])
+    assert first.shape == (2, 2)
+    mock_model.encode.assert_called_once_with(["a", "bb"], convert_to_tensor=False)
+
+    second = nilrag.generate_embeddings_huggingface(["bb", "ccc", "a"])
+    np.testing.assert_array_equal(second[:, 0], [2.0, 3.0, 1.0])
+    mock_model.encode.assert_called_with(["ccc"], convert_to_tensor=False)
+    assert mock_model.encode.call_count == 2
+
+
+def test_query_embedding_keeps_its_shape(mock_model):
+    embedding = nilrag.generate_embeddings_huggingface("query")
+
+    assert embedding.dtype == np.float32
+    np.testing.assert_array_equal(embedding, [5.0, 1.0])
+    np.testing.assert_array_equal(
+        nilrag.generate_embeddings_huggingface("query"), embedding
+    )
+    mock_model.encode.assert_called_once()
+
+
+@pytest.mark.parametrize("onnx", [True, False])
+def test_embeddings_model_uses_int8_onnx_when_available(mocker, onnx):
+    transformer = mocker.patch("nilai_api.handlers.nilrag.SentenceTransformer")
+    mocker.patch("nilai_api.handlers.nilrag._onnx_runtime_available", return_value=onnx)
+    mocker.patch("nilai_api.handlers.nilrag.embeddings_model", None)
+
+    assert nilrag.get_embeddings_model() is transformer.return_value
+    kwargs = transformer.call_args.kwargs
+    if onnx:
+        assert kwargs["backend"] == "onnx"
+        assert kwargs["model_kwargs"] == {"file_name": nilrag.EMBEDDINGS_ONNX_INT8_FILE}
+    else:
+        assert "backend" not in kwargs
+
+
+def test_embeddings_model_runs_in_half_precision_on_cuda(mocker):
+    transformer = mocker.patch("nilai_api.handlers.nilrag.SentenceTransformer")
+    mocker.patch.object(CONFIG.embeddings, "device", "cuda")
+    mocker.patch("nilai_api.handlers.nilrag.embeddings_model", None)
+
+    assert nilrag.get_embeddings_model() is transformer.return_value.half.return_value
+    assert transformer.call_args.kwargs == {"device": "cuda"}
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nilai_api.handlers.tools import code_execution
+from nilai_api.handlers.tools.code_execution import SandboxPool
+
+
+@pytest.fixture
+def booted(mocker):
+    """Sandboxes created by the mocked AsyncSandbox.create, in creation order."""
+    sandboxes = []
+
+    async def create(**kwargs):
+        sandbox = AsyncMock()
+        sandbox.run_code.return_value.text = "42"
+        sandboxes.append(sandbox)
+        return sandbox
+
+    mocker.patch(
+        "nilai_api.handlers.tools.code_execution.AsyncSandbox.create",
+        side_effect=create,
+    )
+    return sandboxes
+
+
+@pytest.mark.asyncio
+async def test_pool_hands_out_booted_sandboxes_once(booted):
+    pool = SandboxPool(size=1)
+    pool.start()
+    await asyncio.sleep(0.05)
+
+    sandbox = await pool.acquire()
+    assert sandbox is booted[0]
+    await pool.release(sandbox)
+    booted[0].kill.assert_awaited_once()
+
+    await pool.stop()
+    assert not pool.running
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_stale_sandboxes(booted):
+    pool = SandboxPool(size=1, max_idle=0.05, check_interval=0.01)
+    pool.start()
+    await asyncio.sleep(0.2)
+
+    booted[0].kill.assert_awaited_once()
+    assert len(booted) > 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_stale_sandboxes_on_acquire(booted):
+    pool = SandboxPool(size=1)
+    stale = AsyncMock()
+    pool._idle = asyncio.Queue()
+    pool._taken = asyncio.Event()
+    pool._idle.put_nowait((time.monotonic() - pool.max_idle, stale))
+
+    sandbox = await pool.acquire()
+
+    assert sandbox is booted[0]
+    stale.kill.assert_awaited_once()
+
+
+def test_pool_requires_e2b_credentials(monkeypatch):
+    monkeypatch.delenv("E2B_API_KEY", raising=False)
+    assert not SandboxPool().configured
+
+    monkeypatch.setenv("E2B_API_KEY", "key")
+    assert SandboxPool().configured
+    assert not SandboxPool(size=0).configured
+
+
+@pytest.mark.asyncio
+async def test_execute_python_boots_a_sandbox_without_pool(booted):
+    assert await code_execution.execute_python("print(6*7)") == "42"
+
+    (sandbox,) = booted
+    sandbox.run_code.assert_awaited_once_with("print(6*7)")
+    sandbox.kill.assert_awaited_once()
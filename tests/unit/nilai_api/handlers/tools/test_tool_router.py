@@ -182,3 +182,17 @@ def test_extract_tool_calls_from_json_content():
     assert tc.function.name == "execute_python"
     parsed_args = json.loads(tc.function.arguments or "{}")
     assert parsed_args == {"code": "print(2+3)"}
+
+
+def test_extract_tool_calls_skips_parsing_plain_text(mocker):
+    loads = mocker.spy(tool_router.json, "loads")
+    msg = ChatCompletionMessage(role="assistant", content="The answer is 42.")
+
+    assert tool_router.extract_tool_calls_from_response_message(msg) == []
+    loads.assert_not_called()
+
+    indented = ChatCompletionMessage(
+        role="assistant",
+        content='\n  {"name": "execute_python", "arguments": {"code": "1"}}',
+    )
+    assert len(tool_router.extract_tool_calls_from_response_message(indented)) == 1
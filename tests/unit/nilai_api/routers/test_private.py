@@ -109,10 +109,17 @@ def mock_metering_context(mocker):
 
 
 @pytest.fixture
-def client(mock_user_manager, mock_metering_context):
+def client(mocker, mock_user_manager, mock_metering_context):
     from nilai_api.app import app
     from nilai_api.credit import LLMMeter
 
+    # The lifespan would create the query log partitions in the database
+    mocker.patch("nilai_api.app.ensure_query_log_partitions", new_callable=AsyncMock)
+    # Nor load the embeddings model
+    mocker.patch("nilai_api.app.warmup_embeddings_model", new_callable=AsyncMock)
+    # Nor boot code execution sandboxes
+    mocker.patch("nilai_api.app.sandbox_pool", autospec=True)
+
     # Override the LLMMeter dependency to avoid actual credit service calls
     app.dependency_overrides[LLMMeter] = lambda: mock_metering_context
 
@@ -0,0 +1,147 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Request
+
+
+def make_request(authorization: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"authorization", authorization.encode())],
+        }
+    )
+
+
+@pytest.fixture
+def mock_parse_envelope(mocker):
+    envelope = MagicMock()
+    envelope.proofs[-1].token.issuer = "did:nil:issuer"
+    return mocker.patch("nilai_api.credit.parse_envelope", return_value=envelope)
+
+
+@pytest.mark.asyncio
+async def test_nuc_issuer_is_memoized_per_request(mock_parse_envelope):
+    from nilai_api.credit import from_nuc_bearer_root_token
+
+    extractor = from_nuc_bearer_root_token()
+    request = make_request("Bearer nuc-token")
+
+    assert await extractor(request) == "did:nil:issuer"
+    assert await extractor(request) == "did:nil:issuer"
+    mock_parse_envelope.assert_called_once_with("nuc-token")
+
+
+@pytest.mark.asyncio
+async def test_nuc_issuer_is_not_shared_across_requests(mock_parse_envelope):
+    from nilai_api.credit import from_nuc_bearer_root_token
+
+    extractor = from_nuc_bearer_root_token()
+
+    await extractor(make_request("Bearer nuc-token"))
+    await extractor(make_request("Bearer nuc-token"))
+
+    assert mock_parse_envelope.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_nuc_issuer_requires_bearer_token(mock_parse_envelope):
+    from nilai_api.credit import from_nuc_bearer_root_token
+
+    with pytest.raises(ValueError):
+        await from_nuc_bearer_root_token()(make_request("Basic abc"))
+    mock_parse_envelope.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_docs_token_meter_skips_metering(mocker):
+    from nilai_api import credit
+
+    base_meter = mocker.patch.object(credit, "_base_llm_meter")
+    meter_dependency = credit.docs_token_meter(b"docs-token")
+
+    meters = [
+        meter async for meter in meter_dependency(make_request("Bearer docs-token"))
+    ]
+
+    assert len(meters) == 1
+    assert isinstance(meters[0], credit.NoOpMeteringContext)
+    base_meter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_docs_token_meter_meters_other_tokens(mocker):
+    from nilai_api import credit
+
+    async def base_meter(request):
+        yield "meter"
+
+    mocker.patch.object(credit, "_base_llm_meter", base_meter)
+    meter_dependency = credit.docs_token_meter(b"docs-token")
+
+    meters = [meter async for meter in meter_dependency(make_request("Bearer other"))]
+
+    assert meters == ["meter"]
+
+
+def test_llm_cost_from_per_million():
+    from nilai_api.credit import LLMCost
+
+    cost = LLMCost.from_per_million(
+        prompt_tokens_price=2.0, completion_tokens_price=4.0, web_search_cost=0.05
+    )
+
+    assert cost.prompt_tokens_price == 2.0 / 1_000_000
+    assert cost.completion_tokens_price == 4.0 / 1_000_000
+    assert cost.total_cost(1_000_000, 500_000, 2) == pytest.approx(4.1)
+
+
+def test_llm_cost_total_cost_batch_matches_total_cost():
+    from nilai_api.credit import LLMCost, LLMUsage
+
+    cost = LLMCost.from_per_million(2.0, 4.0, 0.05)
+    usages = [
+        LLMUsage(prompt_tokens=1_000_000, completion_tokens=500_000, web_searches=2),
+        LLMUsage(prompt_tokens=10, completion_tokens=0, web_searches=0),
+    ]
+
+    assert cost.total_cost_batch(usages) == pytest.approx(
+        [
+            cost.total_cost(u.prompt_tokens, u.completion_tokens, u.web_searches)
+            for u in usages
+        ]
+    )
+    assert cost.total_cost_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_llm_cost_calculator_accepts_usage_objects_and_dicts():
+    from nilai_api.credit import LLMCost, LLMUsage, llm_cost_calculator
+
+    calculator = llm_cost_calculator(
+        {"default": LLMCost.from_per_million(1_000_000.0, 2_000_000.0, 0.5)}
+    )
+    request = make_request("Bearer token")
+
+    usage = LLMUsage(prompt_tokens=1, completion_tokens=2, web_searches=2)
+    assert await calculator(request, {"usage": usage}) == pytest.approx(6.0)
+    usage_dict = {"prompt_tokens": 1, "completion_tokens": 2, "web_searches": 2}
+    assert await calculator(request, {"usage": usage_dict}) == pytest.approx(6.0)
+    assert await calculator(request, {}) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_llm_cost_calculator_uses_request_model():
+    from nilai_api.credit import LLMCost, LLMUsage, llm_cost_calculator
+
+    calculator = llm_cost_calculator(
+        {"priced-model": LLMCost.from_per_million(1_000_000.0, 0.0, 0.0)}
+    )
+    request = make_request("Bearer token")
+    usage = {"usage": LLMUsage(prompt_tokens=3, completion_tokens=0, web_searches=0)}
+
+    assert await calculator(request, usage) == pytest.approx(
+        LLMCost.default().total_cost(3, 0, 0)
+    )
+    request.state.model = "priced-model"
+    assert await calculator(request, usage) == pytest.approx(3.0)
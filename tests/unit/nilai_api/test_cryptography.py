@@ -88,3 +88,65 @@ def test_verify_signature_invalid_signature():
     assert not verify_signature(public_key, message, tampered_signature), (
         "Signature should be invalid"
     )
+
+
+def test_generate_key_pair_is_cached():
+    assert generate_key_pair() is generate_key_pair()
+
+
+def test_generate_key_pair_creates_and_reloads_key_file(tmp_path, monkeypatch):
+    from nilai_api import crypto
+
+    key_path = tmp_path / "private_key.key"
+    monkeypatch.setattr(crypto, "PRIVATE_KEY_PATH", str(key_path))
+    monkeypatch.setattr(crypto, "_KEYPAIR", None)
+
+    private_key, _, _ = generate_key_pair()
+
+    assert key_path.read_bytes() == private_key.private_key
+    assert key_path.stat().st_mode & 0o777 == 0o600
+    assert list(tmp_path.iterdir()) == [key_path]
+
+    monkeypatch.setattr(crypto, "_KEYPAIR", None)
+    reloaded_key, _, _ = generate_key_pair()
+    assert reloaded_key.private_key == private_key.private_key
+
+
+def test_generate_key_pair_without_hard_links(tmp_path, monkeypatch):
+    from nilai_api import crypto
+
+    key_path = tmp_path / "private_key.key"
+    monkeypatch.setattr(crypto, "PRIVATE_KEY_PATH", str(key_path))
+    monkeypatch.setattr(crypto, "_KEYPAIR", None)
+
+    def link(src, dst):
+        raise PermissionError("hard links are not supported")
+
+    monkeypatch.setattr("os.link", link)
+
+    private_key, _, _ = generate_key_pair()
+
+    assert key_path.read_bytes() == private_key.private_key
+    assert key_path.stat().st_mode & 0o777 == 0o600
+    assert list(tmp_path.iterdir()) == [key_path]
+
+
+def test_generate_key_pair_rejects_empty_key_file(tmp_path, monkeypatch):
+    from nilai_api import crypto
+
+    key_path = tmp_path / "private_key.key"
+    key_path.write_bytes(b"")
+    monkeypatch.setattr(crypto, "PRIVATE_KEY_PATH", str(key_path))
+    monkeypatch.setattr(crypto, "_KEYPAIR", None)
+
+    with pytest.raises(ValueError):
+        generate_key_pair()
+
+
+def test_sign_message_accepts_bytes():
+    private_key, public_key, _ = generate_key_pair()
+
+    signature = sign_message(private_key, "Message".encode())
+
+    assert verify_signature(public_key, "Message", signature)
+    assert verify_signature(public_key, b"Message", signature)
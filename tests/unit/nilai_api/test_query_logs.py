@@ -0,0 +1,287 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nilai_api.db.logs import QueryLogBatcher, QueryLogContext
+
+
+@pytest.fixture
+def mock_insert(mocker):
+    return mocker.patch("nilai_api.db.logs._insert_query_logs", new_callable=AsyncMock)
+
+
+@pytest.mark.asyncio
+async def test_batcher_groups_rows(mock_insert):
+    batcher = QueryLogBatcher(max_batch_size=3, max_delay=1.0)
+    batcher.start()
+
+    for i in range(7):
+        await batcher.submit({"id": i})
+    await batcher.stop()
+
+    batches = [call.args[0] for call in mock_insert.await_args_list]
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [row["id"] for batch in batches for row in batch] == list(range(7))
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_after_max_delay(mock_insert):
+    batcher = QueryLogBatcher(max_batch_size=64, max_delay=0.01)
+    batcher.start()
+
+    await batcher.submit({"id": 0})
+    await asyncio.sleep(0.05)
+
+    mock_insert.assert_awaited_once_with([{"id": 0}])
+    await batcher.stop()
+    assert not batcher.running
+
+
+@pytest.mark.asyncio
+async def test_batcher_survives_insert_errors(mock_insert):
+    mock_insert.side_effect = [RuntimeError("boom"), None]
+    batcher = QueryLogBatcher(max_batch_size=1)
+    batcher.start()
+
+    await batcher.submit({"id": 0})
+    await batcher.submit({"id": 1})
+    await batcher.stop()
+
+    assert mock_insert.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batcher_inserts_directly_when_stopped(mock_insert):
+    await QueryLogBatcher().submit({"id": 0})
+
+    mock_insert.assert_awaited_once_with([{"id": 0}])
+
+
+def test_batcher_submit_nowait_does_not_insert_when_stopped(mock_insert):
+    assert not QueryLogBatcher().submit_nowait({"id": 0})
+
+    mock_insert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_context_commit_queues_row(mocker):
+    submit = mocker.patch(
+        "nilai_api.db.logs.query_log_batcher.submit", new_callable=AsyncMock
+    )
+    ctx = QueryLogContext()
+    ctx.set_user("user")
+    ctx.set_model("model")
+    ctx.set_usage(prompt_tokens=10, completion_tokens=5)
+
+    await ctx.commit()
+
+    row = submit.await_args.args[0]
+    assert row["user_id"] == "user"
+    assert row["model"] == "model"
+    assert row["prompt_tokens"] == 10
+    assert row["completion_tokens"] == 5
+    assert "total_tokens" not in row
+
+
+@pytest.mark.asyncio
+async def test_context_commit_skips_incomplete_logs(mocker):
+    submit = mocker.patch(
+        "nilai_api.db.logs.query_log_batcher.submit", new_callable=AsyncMock
+    )
+
+    await QueryLogContext().commit()
+
+    submit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_log_query_uses_core_insert(mocker):
+    from contextlib import asynccontextmanager
+
+    from nilai_api.db.logs import QueryLog, QueryLogManager
+
+    session = AsyncMock()
+
+    @asynccontextmanager
+    async def get_db_session():
+        yield session
+
+    mocker.patch("nilai_api.db.logs.get_db_session", get_db_session)
+
+    await QueryLogManager.log_query(
+        user_id="user",
+        lockid="lock",
+        model="model",
+        prompt_tokens=10,
+        completion_tokens=5,
+        response_time_ms=100,
+        web_search_calls=0,
+        was_streamed=False,
+        was_multimodal=False,
+        was_nilrag=False,
+        was_nildb=False,
+    )
+
+    statement, rows = session.execute.await_args.args
+    assert statement.table is QueryLog.__table__
+    assert rows[0]["user_id"] == "user"
+    assert "total_tokens" not in rows[0]
+    session.add.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_context_commit_stores_null_errors_on_success(mocker):
+    submit = mocker.patch(
+        "nilai_api.db.logs.query_log_batcher.submit", new_callable=AsyncMock
+    )
+    ctx = QueryLogContext()
+    ctx.set_user("user")
+    ctx.set_model("model")
+    ctx.set_usage(prompt_tokens=10, completion_tokens=5)
+
+    await ctx.commit()
+
+    row = submit.await_args.args[0]
+    assert row["error_code"] is None
+    assert row["error_message"] is None
+
+
+@pytest.mark.asyncio
+async def test_context_commit_skips_queries_without_usage_or_error(mocker):
+    submit = mocker.patch(
+        "nilai_api.db.logs.query_log_batcher.submit", new_callable=AsyncMock
+    )
+    ctx = QueryLogContext()
+    ctx.set_user("user")
+    ctx.set_model("model")
+
+    await ctx.commit()
+    submit.assert_not_awaited()
+
+    ctx.set_error(error_code=500, error_message="boom")
+    await ctx.commit()
+    assert submit.await_args.args[0]["error_code"] == 500
+
+
+def test_context_timings_in_milliseconds(mocker):
+    clock = mocker.patch("nilai_api.db.logs.time.perf_counter_ns")
+    clock.return_value = 0
+    ctx = QueryLogContext()
+
+    clock.return_value = 1_000_000
+    ctx.start_model_timing()
+    clock.return_value = 5_999_999
+    ctx.end_model_timing()
+    clock.return_value = 10_000_000
+
+    assert ctx._calculate_timings() == (10, 4, 0)
+
+
+def test_query_log_partitions_span_year_end():
+    from datetime import date
+
+    from nilai_api.db.logs import query_log_partitions
+
+    assert query_log_partitions(date(2026, 11, 16), 2) == [
+        ("query_logs_y2026m11", date(2026, 11, 1), date(2026, 12, 1)),
+        ("query_logs_y2026m12", date(2026, 12, 1), date(2027, 1, 1)),
+        ("query_logs_y2027m01", date(2027, 1, 1), date(2027, 2, 1)),
+    ]
+
+
+@pytest.mark.parametrize(
+    "exists, has_default_rows, expected",
+    [
+        (True, False, []),
+        (False, False, ["CREATE TABLE"]),
+        (False, True, ["DETACH", "CREATE TABLE", "DELETE", "ATTACH"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_partition_creation_moves_default_rows(
+    mocker, exists, has_default_rows, expected
+):
+    from contextlib import asynccontextmanager
+    from datetime import date
+    from unittest.mock import MagicMock
+
+    from nilai_api.db.logs import _create_query_log_partition
+
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.scalar = AsyncMock(side_effect=[exists, has_default_rows])
+
+    @asynccontextmanager
+    async def get_db_session():
+        yield session
+
+    mocker.patch("nilai_api.db.logs.get_db_session", get_db_session)
+
+    await _create_query_log_partition(
+        "query_logs_y2026m11", date(2026, 11, 1), date(2026, 12, 1)
+    )
+
+    # The first statement takes the advisory lock
+    statements = [str(call.args[0]) for call in session.execute.await_args_list][1:]
+    assert len(statements) == len(expected)
+    for statement, keyword in zip(statements, expected):
+        assert keyword in statement
+    if expected:
+        create = statements[expected.index("CREATE TABLE")]
+        assert create == (
+            'CREATE TABLE "query_logs_y2026m11" PARTITION OF query_logs '
+            "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')"
+        )
+
+
+@pytest.mark.asyncio
+async def test_log_query_does_not_raise_database_errors(mocker):
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from nilai_api.db.logs import QueryLogManager
+
+    mocker.patch(
+        "nilai_api.db.logs.get_db_session", side_effect=SQLAlchemyError("db down")
+    )
+
+    await QueryLogManager.log_query(
+        user_id="user",
+        lockid="lock",
+        model="model",
+        prompt_tokens=10,
+        completion_tokens=5,
+        response_time_ms=100,
+        web_search_calls=0,
+        was_streamed=False,
+        was_multimodal=False,
+        was_nilrag=False,
+        was_nildb=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batcher_submit_nowait_drops_rows_when_full(mock_insert):
+    batcher = QueryLogBatcher(max_batch_size=64, max_delay=1.0, max_queue_size=1)
+    batcher.start()
+
+    assert batcher.submit_nowait({"id": 0})
+    assert not batcher.submit_nowait({"id": 1})
+    await batcher.stop()
+
+    batches = [call.args[0] for call in mock_insert.await_args_list]
+    assert sum(len(batch) for batch in batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_submit_drops_rows_when_full(mock_insert):
+    batcher = QueryLogBatcher(max_batch_size=64, max_delay=1.0, max_queue_size=1)
+    batcher.start()
+
+    await asyncio.wait_for(batcher.submit({"id": 0}), 0.1)
+    await asyncio.wait_for(batcher.submit({"id": 1}), 0.1)
+    assert batcher.dropped == 1
+    await batcher.stop()
+
+    batches = [call.args[0] for call in mock_insert.await_args_list]
+    assert sum(len(batch) for batch in batches) == 1
@@ -304,3 +304,43 @@ async def test_queueing_across_seconds(req, redis_client, monkeypatch):
     # Some requests that were rejected should have happened in the first window
     first_window_exceptions = [r[1] for r in exceptions if r[1] < 1.0]
     assert len(first_window_exceptions) >= 1
+
+
+@pytest.mark.asyncio
+async def test_user_cache_does_not_touch_for_good_rate_limit(req, mocker):
+    from contextlib import asynccontextmanager
+
+    from nilai_api.db.users import UserManager, UserModel
+
+    user_id = random_id()
+    rate_limits = RateLimits(user_rate_limit=3)
+    user_limits = UserRateLimits(
+        user_id=user_id, token_rate_limit=None, rate_limits=rate_limits
+    )
+    session = MagicMock()
+    session.get = mocker.AsyncMock(
+        return_value=UserModel(user_id=user_id, rate_limits=rate_limits.model_dump())
+    )
+
+    @asynccontextmanager
+    async def get_db_session():
+        yield session
+
+    mocker.patch("nilai_api.db.users.get_db_session", get_db_session)
+    mocker.patch("nilai_api.db.users.get_user_cache", return_value=req.state.redis)
+    rate_limit = RateLimit()
+    redis = req.state.redis
+
+    for _ in range(3):
+        await consume_generator(rate_limit(req, user_limits))
+    assert await redis.get(f"user:{user_id}") == b"3"
+
+    # Caches the user next to the for-good counter, then reads it back from the cache
+    for _ in range(2):
+        user = await UserManager.check_user(user_id)
+        assert user is not None
+        assert user.rate_limits_obj.user_rate_limit == 3
+    session.get.assert_awaited_once()
+
+    assert await redis.get(f"user:{user_id}") == b"3"
+    assert await redis.ttl(f"user_cache:{user_id}") > 0
@@ -0,0 +1,102 @@
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from nilai_api.db.users import UserManager, UserModel
+
+
+@pytest.fixture
+def mock_cache(mocker):
+    cache = AsyncMock()
+    cache.get.return_value = None
+    mocker.patch("nilai_api.db.users.get_user_cache", return_value=cache)
+    return cache
+
+
+@pytest.fixture
+def mock_session(mocker):
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.get = AsyncMock()
+
+    @asynccontextmanager
+    async def get_db_session():
+        yield session
+
+    mocker.patch("nilai_api.db.users.get_db_session", get_db_session)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_check_user_caches_database_lookups(mock_cache, mock_session):
+    rate_limits = {"user_rate_limit_day": 10}
+    mock_session.get.return_value = UserModel(user_id="user", rate_limits=rate_limits)
+
+    user = await UserManager.check_user("user")
+
+    assert user is not None
+    assert user.rate_limits == rate_limits
+    mock_cache.set.assert_awaited_once()
+    key, value = mock_cache.set.await_args.args
+    assert key == "user_cache:user"
+    assert json.loads(value) == rate_limits
+
+    mock_cache.get.return_value = value
+    mock_session.get.reset_mock()
+    cached_user = await UserManager.check_user("user")
+
+    assert cached_user is not None
+    assert cached_user.user_id == "user"
+    assert cached_user.rate_limits == rate_limits
+    mock_session.get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_user_falls_back_to_database_without_redis(
+    mock_cache, mock_session
+):
+    mock_cache.get.side_effect = RedisError("unavailable")
+    mock_cache.set.side_effect = RedisError("unavailable")
+    mock_session.get.return_value = UserModel(user_id="user", rate_limits=None)
+
+    user = await UserManager.check_user("user")
+
+    assert user is not None
+    assert user.rate_limits is None
+
+
+@pytest.mark.asyncio
+async def test_update_rate_limits_invalidates_cached_user(mock_cache, mock_session):
+    from nilai_api.db.users import RateLimits
+
+    mock_session.get.return_value = UserModel(user_id="user", rate_limits=None)
+
+    assert await UserManager.update_rate_limits("user", RateLimits())
+    mock_cache.delete.assert_awaited_once_with("user_cache:user")
+
+
+def test_effective_limits_apply_config_defaults_and_are_memoized():
+    from nilai_api.config import CONFIG
+    from nilai_api.db.users import RateLimits
+
+    limits = RateLimits(user_rate_limit_day=5).get_effective_limits()
+
+    assert limits.user_rate_limit_day == 5
+    assert limits.user_rate_limit_hour == CONFIG.rate_limiting.user_rate_limit_hour
+    assert RateLimits(user_rate_limit_day=5).get_effective_limits() is limits
+    assert RateLimits().get_effective_limits() is not limits
+
+
+def test_user_data_shares_default_rate_limits():
+    from nilai_api.db.users import RateLimits, UserData
+
+    first = UserData(user_id="first")
+    second = UserData(user_id="second")
+
+    assert first.rate_limits is second.rate_limits
+    assert first.rate_limits == RateLimits().get_effective_limits()
+    with pytest.raises(ValueError):
+        first.rate_limits.user_rate_limit_day = 1
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from nuc.token import Did
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
 from nilai_api.auth.nuc_helpers.nildb_document import PromptDocument
 from ..nuc_helpers import DummyDecodedNucToken, DummyNucTokenEnvelope
 
@@ -9,6 +10,7 @@ class TestPromptDocument(unittest.TestCase):
     def setUp(self):
         """Clear the cache before each test"""
         PromptDocument.from_token.cache_clear()
+        parse_envelope.cache_clear()
 
     @patch("nuc.envelope.NucTokenEnvelope.parse")
     def test_from_token_no_document_id_returns_none(self, mock_parse):
@@ -132,6 +134,35 @@ class TestPromptDocument(unittest.TestCase):
         self.assertEqual(result.document_id, document_id)  # type: ignore
         self.assertEqual(result.owner_did, issuer_did)  # type: ignore
 
+    def test_from_envelope_does_not_parse(self):
+        """Test that from_envelope uses the already parsed envelope"""
+        issuer_did = f"did:nil:{'1' * 66}"
+        proofs = [
+            DummyDecodedNucToken(
+                {"document_id": "parsed-document", "document_owner_did": issuer_did},
+                Did.parse(issuer_did),
+            )
+        ]
+        with patch("nuc.envelope.NucTokenEnvelope.parse") as mock_parse:
+            result = PromptDocument.from_envelope(DummyNucTokenEnvelope(proofs))  # type: ignore
+
+            mock_parse.assert_not_called()
+        self.assertEqual(result.document_id, "parsed-document")  # type: ignore
+
+    def test_envelope_parse_is_shared_with_token_rate_limits(self):
+        """Test that PromptDocument and TokenRateLimits share one parse per token"""
+        from nilai_api.auth.nuc_helpers.usage import TokenRateLimits
+
+        TokenRateLimits.from_token.cache_clear()
+        with patch("nuc.envelope.NucTokenEnvelope.parse") as mock_parse:
+            mock_parse.return_value = DummyNucTokenEnvelope([DummyDecodedNucToken({})])
+
+            PromptDocument.from_token("shared_token")
+            TokenRateLimits.from_token("shared_token")
+
+            mock_parse.assert_called_once_with("shared_token")
+        TokenRateLimits.from_token.cache_clear()
+
     def test_prompt_document_model_validation(self):
         """Test that PromptDocument model validates correctly"""
         issuer_did = f"did:nil:{'1' * 66}"
@@ -171,6 +202,27 @@ class TestPromptDocument(unittest.TestCase):
             self.assertEqual(result1.document_id, result2.document_id)  # type: ignore
             self.assertEqual(result1.owner_did, result2.owner_did)  # type: ignore
 
+    def test_cache_does_not_store_errors(self):
+        """Test that a token failing the owner check is not cached"""
+        with patch("nuc.envelope.NucTokenEnvelope.parse") as mock_parse:
+            proofs = [
+                DummyDecodedNucToken(
+                    {
+                        "document_id": "mismatched-document",
+                        "document_owner_did": f"did:nil:{'2' * 66}",
+                    },
+                    Did.parse(f"did:nil:{'1' * 66}"),
+                )
+            ]
+            mock_parse.return_value = DummyNucTokenEnvelope(proofs)
+
+            with self.assertRaises(ValueError):
+                PromptDocument.from_token("test_token")
+            with self.assertRaises(ValueError):
+                PromptDocument.from_token("test_token")
+
+            self.assertEqual(len(PromptDocument.from_token.cache), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch
+from nilai_api.auth.nuc_helpers.envelope import parse_envelope
 from nilai_api.auth.nuc_helpers.usage import (
     TokenRateLimits,
     UsageLimitError,
@@ -14,6 +15,7 @@ class GetUsageLimitTests(unittest.TestCase):
     def setUp(self):
         """Clear the cache before each test, because the cache is global and we use the same dummy token for all tests."""
         TokenRateLimits.from_token.cache_clear()
+        parse_envelope.cache_clear()
 
     @patch("nuc.envelope.NucTokenEnvelope.parse")
     def test_no_usage_limit_returns_none(self, mock_parse):
@@ -248,6 +250,37 @@ class GetUsageLimitTests(unittest.TestCase):
         # Check expires_at is less than 1 day from now
         self.assertLess(expires_at, datetime.now(timezone.utc) + timedelta(days=1))  # type: ignore
 
+    def test_ms_remaining_counts_down_to_expiry(self):
+        from nilai_api.auth.nuc_helpers.usage import TokenRateLimit
+
+        limit = TokenRateLimit(
+            signature="sig",
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=60),
+            usage_limit=1,
+        )
+
+        self.assertGreater(limit.ms_remaining, 59_000)
+        self.assertLessEqual(limit.ms_remaining, 60_000)
+        self.assertNotIn("_expires_at_ms", repr(limit))
+
+    def test_get_limit_by_signature(self):
+        from nilai_api.auth.nuc_helpers.usage import TokenRateLimit
+
+        expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+        limits = TokenRateLimits(
+            limits=[
+                TokenRateLimit(signature="a", expires_at=expires_at, usage_limit=10),
+                TokenRateLimit(signature="b", expires_at=expires_at, usage_limit=5),
+            ]
+        )
+
+        self.assertEqual(limits.get_limit("b").usage_limit, 5)  # type: ignore
+        self.assertIsNone(limits.get_limit("missing"))
+
+    def test_empty_limits_are_rejected(self):
+        with self.assertRaises(ValueError):
+            TokenRateLimits(limits=[])
+
 
 if __name__ == "__main__":
     unittest.main()